@@ -0,0 +1,10 @@
+"""
+Artificial Insanity Podcast - Automatic Transcript Generator
+Fetches episodes from YouTube and generates SEO-optimized transcript pages
+
+Run ``python -m ai_transcripts --help`` for the available stages. Network
+clients are only imported by the stages that actually talk to YouTube, so
+render-only invocations start quickly.
+"""
+
+__version__ = '2.0.0'
@@ -0,0 +1,193 @@
+"""
+Command-line entry point
+
+    python -m ai_transcripts            list, fetch and render (the weekly job)
+    python -m ai_transcripts list       refresh the cached catalogue
+    python -m ai_transcripts fetch      fetch missing transcripts into the cache
+    python -m ai_transcripts render     regenerate pages from cached data only
+    python -m ai_transcripts publish    upload changed pages to a deploy target
+    python -m ai_transcripts watch      rebuild affected pages as templates or data change
+
+With --dry-run nothing is fetched or written: for the default run and render,
+pages are rendered from the cached data and compared with the output
+directory; for publish, the manifest is diffed against the target's. The exit
+status is CHANGES_EXIT_CODE if anything would change.
+"""
+
+import argparse
+import os
+
+from . import config, store
+from .profiling import NO_INSTRUMENTATION, Instrumentation
+from .sessions import DEFAULT_POOL_SIZE
+from .pipeline import (ORPHAN_MODES, fetch_transcripts, list_videos, plan_render, print_plan,
+                       publish_site, render_site)
+
+# Distinct from 1 (uncaught error) and 2 (usage error) so scripts can tell them apart
+CHANGES_EXIT_CODE = 3
+
+PROFILE_DIR = os.path.join(config.CACHE_DIR, 'profile')
+
+
+def _non_negative_int(value):
+    """argparse type for counts where 0 means off"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number {value!r}") from None
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, not {number}")
+    return number
+
+
+def _positive_int(value):
+    """argparse type for sizes and counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be 1 or more, not {number}")
+    return number
+
+
+def build_parser():
+    """Build the argument parser with one sub-command per stage"""
+    parser = argparse.ArgumentParser(
+        prog='ai_transcripts',
+        description='Generate Artificial Insanity transcript pages from YouTube.'
+    )
+    parser.add_argument('--data-dir', default=config.DATA_DIR,
+                        help=f"catalogue and transcript cache (default: {config.DATA_DIR})")
+    parser.add_argument('--out-dir', default=config.TRANSCRIPTIONS_DIR,
+                        help=f"generated pages (default: {config.TRANSCRIPTIONS_DIR})")
+    parser.add_argument('--orphans', choices=ORPHAN_MODES, default='delete',
+                        help="what to do with pages for videos deleted from the channel "
+                             "or made private (default: delete)")
+    parser.add_argument('--chunk-minutes', type=_non_negative_int, default=0, metavar='N',
+                        help='inline only the first N minutes of long transcripts and load '
+                             'the rest in N-minute sections as the reader scrolls (default: off)')
+    parser.add_argument('--related', type=int, default=3, metavar='N',
+                        help='link the N most similar episodes (TF-IDF) from each page; '
+                             '0 disables (default: 3)')
+    parser.add_argument('--pool-size', type=_positive_int, default=DEFAULT_POOL_SIZE, metavar='N',
+                        help=f"keep-alive connections per host for transcript downloads "
+                             f"(default: {DEFAULT_POOL_SIZE})")
+    parser.add_argument('--proxy', metavar='URL',
+                        help='send transcript downloads through this HTTP(S) proxy')
+    parser.add_argument('--dry-run', action='store_true',
+                        help=f"report which pages would change, using cached data only; "
+                             f"exit {CHANGES_EXIT_CODE} if any would")
+    parser.add_argument('--profile', action='store_true',
+                        help='cProfile each stage, save <stage>.pstats in the profile directory '
+                             'and print the top functions')
+    parser.add_argument('--profile-dir', metavar='DIR',
+                        help=f"where --profile saves its .pstats files; implies --profile "
+                             f"(default: {PROFILE_DIR})")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='report peak memory and top allocation sites for each stage')
+    parser.add_argument('--top', type=_positive_int, default=15, metavar='N',
+                        help='entries to show in profile and memory reports (default: 15)')
+
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.add_parser('list', help='list channel uploads into the catalogue')
+    fetch = commands.add_parser('fetch', help='fetch transcripts for the cached catalogue')
+    fetch.add_argument('--refresh', action='store_true',
+                       help='refetch transcripts that are already cached')
+    fetch.add_argument('--skip-uncaptioned', action='store_true',
+                       help='also skip videos with no uploaded caption tracks '
+                            '(the API does not report auto-generated captions)')
+    commands.add_parser('render', help='render pages from cached data (no network)')
+    publish = commands.add_parser('publish', help='upload pages changed since the last publish')
+    publish.add_argument('target', help="deploy target: a directory path or 'dir:PATH'")
+    watch_command = commands.add_parser(
+        'watch', help='rebuild only the affected pages whenever templates or cached data change')
+    watch_command.add_argument('--serve', nargs='?', type=int, const=config.SERVE_PORT,
+                               metavar='PORT',
+                               help=f"also serve the output directory on localhost "
+                                    f"(default PORT: {config.SERVE_PORT})")
+    return parser
+
+
+def _require_api_key():
+    if not config.YOUTUBE_API_KEY:
+        raise SystemExit("✗ YOUTUBE_API_KEY is not set")
+    return config.YOUTUBE_API_KEY
+
+
+def main(argv=None):
+    """Main execution function"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    profile_dir = args.profile_dir or (PROFILE_DIR if args.profile else None)
+    if profile_dir or args.trace_memory:
+        instrumentation = Instrumentation(profile_dir, args.trace_memory, args.top)
+    else:
+        instrumentation = NO_INSTRUMENTATION
+    stage = instrumentation.stage
+
+    if args.command == 'publish':
+        from .publish import open_target
+
+        try:
+            target = open_target(args.target)
+        except ValueError as e:
+            parser.error(str(e))
+        with stage('publish'):
+            changed = publish_site(args.data_dir, args.out_dir, target, dry_run=args.dry_run)
+        return CHANGES_EXIT_CODE if args.dry_run and changed else 0
+
+    if args.dry_run:
+        if args.command not in (None, 'render'):
+            parser.error(f"--dry-run does not apply to {args.command}")
+        with stage('plan'):
+            plan = plan_render(args.data_dir, args.out_dir, store.load_catalogue(args.data_dir),
+                               orphans=args.orphans, chunk_seconds=args.chunk_minutes * 60,
+                               related_count=args.related)
+        return CHANGES_EXIT_CODE if print_plan(plan) else 0
+
+    if args.command == 'list':
+        with stage('list'):
+            list_videos(args.data_dir, _require_api_key(), config.CHANNEL_ID)
+    elif args.command == 'fetch':
+        with stage('fetch'):
+            fetch_transcripts(args.data_dir, store.load_catalogue(args.data_dir),
+                              refresh=args.refresh, skip_uncaptioned=args.skip_uncaptioned,
+                              pool_size=args.pool_size, proxy=args.proxy)
+    elif args.command == 'render':
+        with stage('render'):
+            render_site(args.data_dir, args.out_dir, store.load_catalogue(args.data_dir),
+                        orphans=args.orphans, chunk_seconds=args.chunk_minutes * 60,
+                        related_count=args.related)
+    elif args.command == 'watch':
+        from .watch import watch
+
+        watch(args.data_dir, args.out_dir, orphans=args.orphans,
+              chunk_seconds=args.chunk_minutes * 60, related_count=args.related, port=args.serve)
+    else:
+        run_all(args, stage)
+    return 0
+
+
+def run_all(args, stage):
+    """List, fetch and render in one go"""
+    print("🎙️  Fetching Artificial Insanity episodes from YouTube...")
+
+    with stage('list'):
+        videos = list_videos(args.data_dir, _require_api_key(), config.CHANNEL_ID)
+    with stage('fetch'):
+        successful_transcripts, failed_transcripts = fetch_transcripts(
+            args.data_dir, videos, pool_size=args.pool_size, proxy=args.proxy)
+
+    print("\n📋 Generating pages...")
+    with stage('render'):
+        render_site(args.data_dir, args.out_dir, videos, orphans=args.orphans,
+                    chunk_seconds=args.chunk_minutes * 60, related_count=args.related)
+
+    print(f"\n🎉 Done! Processed {len(videos)} episodes")
+    print(f"   ✓ {successful_transcripts} transcripts retrieved")
+    print(f"   ⚠ {failed_transcripts} transcripts unavailable")
+    print(f"\nAll pages generated in /{args.out_dir}/")
+    print("\nNote: Some transcripts may be unavailable if captions aren't enabled yet.")
+    print("YouTube usually generates captions within 24-48 hours of upload.")
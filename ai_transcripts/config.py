@@ -0,0 +1,15 @@
+"""Shared configuration for the transcript generator"""
+
+import os
+
+YOUTUBE_API_KEY = os.environ.get('YOUTUBE_API_KEY')
+CHANNEL_ID = 'UC1g-EKfoM_OblzPGBF0N6bQ'
+
+# Generated site pages
+TRANSCRIPTIONS_DIR = 'transcriptions'
+# Listed catalogue and fetched transcripts, committed so later stages can run offline
+DATA_DIR = 'data'
+# Local build caches (compiled templates etc.), safe to delete
+CACHE_DIR = '.cache'
+# Localhost port for `watch --serve`
+SERVE_PORT = 8000
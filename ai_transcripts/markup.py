@@ -0,0 +1,24 @@
+"""HTML escaping helpers shared by the templates and page generators"""
+
+
+class Markup(str):
+    """A string that is already safe HTML and must not be escaped again"""
+
+    __slots__ = ()
+
+
+def escape(value):
+    """
+    Escape &, <, >, " and ' for use in HTML text or a quoted attribute.
+
+    str.replace returns the original object when there is nothing to replace,
+    so clean input (the common case for captions) comes back untouched without
+    any copies being made.
+    """
+    if value.__class__ is not str:
+        if isinstance(value, Markup):
+            return value
+        value = str(value)
+    return (value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            .replace('"', '&quot;').replace("'", '&#39;'))
+
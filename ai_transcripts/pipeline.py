@@ -0,0 +1,369 @@
+"""
+Generator stages: list -> fetch -> render -> publish
+
+Each stage reads its inputs from the data cache and writes its outputs back,
+so any stage can be rerun on its own. Only ``list_videos`` and
+``fetch_transcripts`` touch the network.
+"""
+
+import hashlib
+import os
+
+from . import config, store
+from .sessions import DEFAULT_POOL_SIZE, create_session, print_connection_stats
+from .render import (FRAGMENT_DIR, episode_filename, episode_fragments, generate_episode_page,
+                     generate_index_page, generate_tombstone_page, write_episode_page,
+                     write_index_page)
+
+# What to do with episode pages whose video is no longer in the catalogue
+ORPHAN_MODES = ('delete', 'tombstone', 'keep')
+# Privacy statuses whose pages are pruned like those of deleted videos
+HIDDEN_STATUSES = ('private', 'unavailable')
+
+_EPISODE_PREFIX = 'episode-'
+_EPISODE_SUFFIX = '.html'
+
+
+def list_videos(data_dir, api_key, channel_id):
+    """List the channel's uploads, enrich new or changed ones and cache them as the catalogue"""
+    from .youtube import get_channel_videos
+
+    videos = get_channel_videos(api_key, channel_id)
+    print(f"✓ Found {len(videos)} episodes")
+    enrich_videos(data_dir, videos, api_key)
+    store.save_catalogue(data_dir, videos)
+    return videos
+
+
+def enrich_videos(data_dir, videos, api_key):
+    """
+    Add duration, caption flag and status to each video. Details are carried
+    over from the previous catalogue for videos whose snippet is unchanged and
+    whose transcript is already cached; the rest are looked up in batches.
+    """
+    from .youtube import DETAIL_KEYS, get_video_details
+
+    previous = {video['video_id']: video for video in store.load_catalogue(data_dir)}
+    cached = store.cached_transcript_ids(data_dir)
+
+    stale = []
+    for video in videos:
+        old = previous.get(video['video_id'])
+        if (video['video_id'] in cached and old is not None and 'privacy_status' in old
+                and all(old.get(key) == value for key, value in video.items())):
+            video.update((key, old[key]) for key in DETAIL_KEYS)
+        else:
+            stale.append(video)
+
+    if not stale:
+        return
+    details = get_video_details(api_key, [video['video_id'] for video in stale])
+    for video in stale:
+        video.update(details[video['video_id']])
+    print(f"✓ Looked up details for {len(stale)} episodes")
+
+
+def is_public(video):
+    """False for videos that enrichment found private or gone; unenriched ones count as public"""
+    return video.get('privacy_status') not in HIDDEN_STATUSES
+
+
+def skip_reason(video, skip_uncaptioned=False):
+    """Why a transcript fetch for this video is known to be pointless, or None"""
+    if 'privacy_status' not in video:
+        # Not enriched yet; nothing is known, so try
+        return None
+    if video['privacy_status'] in HIDDEN_STATUSES:
+        return video['privacy_status']
+    if video['live_broadcast'] in ('upcoming', 'live'):
+        return video['live_broadcast']
+    if video['upload_status'] != 'processed':
+        return 'still processing'
+    if skip_uncaptioned and not video['has_captions']:
+        return 'no caption tracks'
+    return None
+
+
+def fetch_transcripts(data_dir, videos, refresh=False, skip_uncaptioned=False,
+                      pool_size=DEFAULT_POOL_SIZE, proxy=None):
+    """
+    Fetch transcripts for catalogue videos that have none cached yet, skipping
+    videos whose details show the fetch cannot succeed. All requests share one
+    pooled keep-alive session.
+    Returns (retrieved, unavailable) counts.
+    """
+    from .youtube import get_transcript
+
+    cached = set() if refresh else store.cached_transcript_ids(data_dir)
+    pending = [video for video in videos if video['video_id'] not in cached]
+    if len(pending) < len(videos):
+        print(f"✓ {len(videos) - len(pending)} transcripts already cached")
+
+    skipped = {}
+    for video in pending:
+        reason = skip_reason(video, skip_uncaptioned)
+        if reason:
+            skipped[video['video_id']] = reason
+    if skipped:
+        pending = [video for video in pending if video['video_id'] not in skipped]
+        reasons = sorted(set(skipped.values()))
+        print(f"⏭ Skipping {len(skipped)} episodes ({', '.join(reasons)})")
+
+    successful_transcripts = 0
+    failed_transcripts = 0
+    if not pending:
+        return successful_transcripts, len(skipped)
+
+    session = create_session(pool_size, proxy)
+    try:
+        for i, video in enumerate(pending, 1):
+            print(f"\n📝 Processing {i}/{len(pending)}: {video['title'][:50]}...")
+
+            # Get transcript with retry logic
+            transcript = get_transcript(video['video_id'], session=session)
+
+            if transcript:
+                store.save_transcript(data_dir, video['video_id'], transcript)
+                successful_transcripts += 1
+            else:
+                failed_transcripts += 1
+    finally:
+        print_connection_stats(session)
+        session.close()
+
+    return successful_transcripts, failed_transcripts + len(skipped)
+
+
+def find_orphans(out_dir, videos):
+    """
+    Return the episode page filenames in out_dir with no public video in the
+    catalogue. Uses a single directory scan and no per-file stat calls.
+    """
+    listed = {episode_filename(video['video_id']) for video in videos if is_public(video)}
+    try:
+        with os.scandir(out_dir) as entries:
+            names = [entry.name for entry in entries]
+    except FileNotFoundError:
+        return []
+    return sorted(
+        name for name in names
+        if name.startswith(_EPISODE_PREFIX) and name.endswith(_EPISODE_SUFFIX) and name not in listed
+    )
+
+
+def find_stale_fragments(out_dir, expected):
+    """Return fragment paths under out_dir that the current render did not produce"""
+    try:
+        with os.scandir(os.path.join(out_dir, FRAGMENT_DIR)) as entries:
+            paths = [f"{FRAGMENT_DIR}/{entry.name}" for entry in entries]
+    except FileNotFoundError:
+        return []
+    return sorted(path for path in paths if path not in expected)
+
+
+def _orphans_to_prune(out_dir, videos, orphans):
+    """Orphan filenames to act on, or [] when pruning is off"""
+    if orphans == 'keep':
+        return []
+    return find_orphans(out_dir, videos)
+
+
+def build_related(data_dir, videos, count):
+    """Related episodes for every video, or {} if disabled or NumPy/SciPy are missing"""
+    if count <= 0:
+        return {}
+    try:
+        from .related import related_episodes
+
+        return related_episodes(data_dir, videos, count, cache_dir=config.CACHE_DIR)
+    except ImportError as e:
+        print(f"⚠ Skipping related episodes ({e.name} is not installed)")
+        return {}
+
+
+def warn_empty_catalogue(data_dir):
+    """
+    Explain why nothing is rendered. Every stage that writes pages stops on an
+    empty catalogue: it means nothing has been listed yet, not that every
+    episode is gone, and rendering or pruning would blank the site.
+    """
+    print(f"⚠ No episodes in {os.path.join(data_dir, store.CATALOGUE_FILE)}, not rendering "
+          f"(run 'list' and 'fetch' first)")
+
+
+def write_episode(out_dir, video, transcript, chunk_seconds=0, related=None):
+    """Write one episode page into out_dir"""
+    with open(os.path.join(out_dir, episode_filename(video['video_id'])), 'w', encoding='utf-8') as f:
+        write_episode_page(f, video, transcript, chunk_seconds, related)
+
+
+def write_fragments(out_dir, video, transcript, chunk_seconds=0):
+    """Write an episode's deferred transcript sections into out_dir; return their paths"""
+    paths = []
+    for path, html in episode_fragments(video, transcript, chunk_seconds):
+        os.makedirs(os.path.join(out_dir, FRAGMENT_DIR), exist_ok=True)
+        with open(os.path.join(out_dir, path), 'w', encoding='utf-8') as f:
+            f.write(html)
+        paths.append(path)
+    return paths
+
+
+def prune_orphans(out_dir, videos, orphans='delete'):
+    """
+    Delete or tombstone pages for videos no longer in the catalogue or no
+    longer public; return their filenames. Callers must not pass an empty
+    catalogue (see warn_empty_catalogue).
+    """
+    stale = _orphans_to_prune(out_dir, videos, orphans)
+    for filename in stale:
+        path = os.path.join(out_dir, filename)
+        if orphans == 'tombstone':
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generate_tombstone_page())
+        else:
+            os.remove(path)
+    return stale
+
+
+def render_site(data_dir, out_dir, videos, orphans='delete', chunk_seconds=0, related_count=0):
+    """
+    Render every episode page (plus its deferred transcript sections when
+    ``chunk_seconds`` is set) and the index from cached data, then delete or
+    tombstone pages for videos that are no longer in the catalogue or are
+    no longer public
+    """
+    if not videos:
+        warn_empty_catalogue(data_dir)
+        return
+    catalogue, videos = videos, [video for video in videos if is_public(video)]
+    os.makedirs(out_dir, exist_ok=True)
+
+    related = build_related(data_dir, videos, related_count)
+    fragments = set()
+    for video in videos:
+        transcript = store.load_transcript(data_dir, video['video_id'])
+        write_episode(out_dir, video, transcript, chunk_seconds, related.get(video['video_id']))
+        fragments.update(write_fragments(out_dir, video, transcript, chunk_seconds))
+
+    print(f"✓ Generated {len(videos)} episode pages")
+    if fragments:
+        print(f"✓ Generated {len(fragments)} deferred transcript sections")
+
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        write_index_page(f, videos)
+
+    print(f"✓ Generated: index.html")
+
+    stale = prune_orphans(out_dir, catalogue, orphans)
+    if stale:
+        action = 'Tombstoned' if orphans == 'tombstone' else 'Removed'
+        print(f"✓ {action} {len(stale)} stale episode pages")
+
+    # Sections are only ever reached from their episode page, so stale ones always go
+    stale_fragments = find_stale_fragments(out_dir, fragments)
+    for path in stale_fragments:
+        os.remove(os.path.join(out_dir, path))
+    if stale_fragments:
+        print(f"✓ Removed {len(stale_fragments)} stale transcript sections")
+
+    from .publish import update_manifest
+
+    manifest = update_manifest(data_dir, out_dir)
+    print(f"✓ Updated publish manifest ({len(manifest['files'])} files)")
+
+
+def _compare(out_dir, filename, html):
+    """Compare a rendered page with the file on disk by content hash"""
+    data = html.encode('utf-8')
+    try:
+        with open(os.path.join(out_dir, filename), 'rb') as f:
+            existing = f.read()
+    except FileNotFoundError:
+        return ('added', filename, 0, len(data))
+    if hashlib.sha256(existing).digest() == hashlib.sha256(data).digest():
+        return ('unchanged', filename, len(existing), len(data))
+    return ('changed', filename, len(existing), len(data))
+
+
+def plan_render(data_dir, out_dir, videos, orphans='delete', chunk_seconds=0, related_count=0):
+    """
+    Render every page in memory and compare it with what is in out_dir by
+    content hash, without writing anything.
+    Returns a list of (status, filename, old_size, new_size) where status is
+    'added', 'changed', 'removed' or 'unchanged'.
+    """
+    if not videos:
+        warn_empty_catalogue(data_dir)
+        return []
+    catalogue, videos = videos, [video for video in videos if is_public(video)]
+    related = build_related(data_dir, videos, related_count)
+    plan = []
+    fragments = set()
+    for video in videos:
+        transcript = store.load_transcript(data_dir, video['video_id'])
+        html = generate_episode_page(video, transcript, chunk_seconds, related.get(video['video_id']))
+        plan.append(_compare(out_dir, episode_filename(video['video_id']), html))
+        for path, html in episode_fragments(video, transcript, chunk_seconds):
+            plan.append(_compare(out_dir, path, html))
+            fragments.add(path)
+    plan.append(_compare(out_dir, 'index.html', generate_index_page(videos)))
+
+    for filename in _orphans_to_prune(out_dir, catalogue, orphans):
+        if orphans == 'tombstone':
+            plan.append(_compare(out_dir, filename, generate_tombstone_page()))
+        else:
+            plan.append(('removed', filename, os.path.getsize(os.path.join(out_dir, filename)), 0))
+    for path in find_stale_fragments(out_dir, fragments):
+        plan.append(('removed', path, os.path.getsize(os.path.join(out_dir, path)), 0))
+    return plan
+
+
+def print_plan(plan):
+    """Print a diff summary of a render plan; return True if anything would change"""
+    counts = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+    symbols = {'added': '+', 'changed': '~', 'removed': '-'}
+    net = 0
+    for status, filename, old_size, new_size in plan:
+        counts[status] += 1
+        if status != 'unchanged':
+            net += new_size - old_size
+            print(f"  {symbols[status]} {filename:<28} {new_size - old_size:>+10,} bytes")
+
+    print(f"🔍 Dry run: {counts['added']} added, {counts['changed']} changed, "
+          f"{counts['removed']} removed, {counts['unchanged']} unchanged ({net:+,} bytes)")
+    return counts['added'] + counts['changed'] + counts['removed'] > 0
+
+
+def publish_site(data_dir, out_dir, target, dry_run=False):
+    """
+    Upload files that changed since the target's last publish and delete the
+    ones that were removed (see ``publish.open_target`` for targets). Returns
+    True if anything changed (or would, with ``dry_run``).
+    """
+    from .publish import diff_manifests, update_manifest
+
+    if not os.path.isdir(out_dir):
+        raise SystemExit(f"✗ {out_dir}/ does not exist, nothing to publish (run 'render' first)")
+    manifest = update_manifest(data_dir, out_dir, save=not dry_run)
+    upload, delete = diff_manifests(manifest, target.read_manifest())
+
+    files = manifest['files']
+    if dry_run:
+        for path in upload:
+            print(f"  ↑ {path:<28} {files[path]['size']:>10,} bytes")
+        for path in delete:
+            print(f"  ✗ {path}")
+        print(f"🔍 Dry run: would upload {len(upload)} and delete {len(delete)} of "
+              f"{len(files)} files on {target}")
+        return bool(upload or delete)
+
+    for path in upload:
+        target.upload(path, os.path.join(out_dir, path), files[path])
+    for path in delete:
+        target.delete(path)
+    target.write_manifest(manifest)
+
+    uploaded_bytes = sum(files[path]['size'] for path in upload)
+    print(f"✓ Published to {target}: {len(upload)} uploaded ({uploaded_bytes:,} bytes), "
+          f"{len(delete)} deleted, {len(files) - len(upload)} unchanged")
+    return bool(upload or delete)
@@ -0,0 +1,86 @@
+"""
+Optional per-stage CPU profiling and memory tracing
+
+The CLI wraps each stage in ``Instrumentation.stage(name)``. When neither
+--profile nor --trace-memory is given it uses ``NO_INSTRUMENTATION`` instead,
+whose stages are a shared no-op context manager, so cProfile and tracemalloc
+are never imported or started.
+"""
+
+import contextlib
+import os
+import sys
+
+
+class Instrumentation:
+    """Profile and/or trace memory for each stage wrapped in ``stage()``"""
+
+    def __init__(self, profile_dir=None, trace_memory=False, top=15):
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+        self.top = top
+        self._snapshot = None
+        if trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+            self._snapshot = tracemalloc.take_snapshot()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Instrument the code run inside the ``with`` block as stage ``name``"""
+        profiler = None
+        if self.profile_dir:
+            import cProfile
+            profiler = cProfile.Profile()
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.reset_peak()
+
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            # Report memory first so the profile report's own allocations are not counted
+            if self.trace_memory:
+                self._report_memory(name)
+            if profiler:
+                self._report_profile(name, profiler)
+
+    def _report_profile(self, name, profiler):
+        import pstats
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{name}.pstats")
+        profiler.dump_stats(path)
+        print(f"\n⏱  Profile for {name} (saved to {path}), top {self.top} by cumulative time:")
+        pstats.Stats(profiler, stream=sys.stdout).strip_dirs().sort_stats('cumulative').print_stats(self.top)
+
+    def _report_memory(self, name):
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ])
+        print(f"\n🧠 Memory for {name}: {current / 1024:,.1f} KiB live, {peak / 1024:,.1f} KiB peak")
+        print(f"   Top {self.top} allocation sites grown during {name}:")
+        for stat in snapshot.compare_to(self._snapshot, 'lineno')[:self.top]:
+            print(f"   {stat}")
+        self._snapshot = snapshot
+
+
+class _NoInstrumentation:
+    """Stand-in used when instrumentation is off"""
+
+    _null = contextlib.nullcontext()
+
+    def stage(self, name):
+        return self._null
+
+
+NO_INSTRUMENTATION = _NoInstrumentation()
@@ -0,0 +1,175 @@
+"""
+Content-addressed publish manifest and delta uploads
+
+The render stage records every file in the output directory in a manifest
+(path -> sha256, size, content type and compressed variants). ``publish``
+diffs that manifest against the one last written to the target and only
+uploads changed files and deletes removed ones, so deploy time scales with
+the number of changed episodes rather than the size of the site.
+
+Targets are small adapters with four operations (read_manifest, upload,
+delete, write_manifest). Only a local directory mirror exists today; an
+object-store adapter only has to implement the same four methods and be
+registered in ``TARGETS``.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Files smaller than this are not worth a compressed variant
+MIN_COMPRESS_SIZE = 256
+_COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+
+def content_type(path):
+    """Guess the Content-Type header for a published file"""
+    guessed, _ = mimetypes.guess_type(path)
+    guessed = guessed or 'application/octet-stream'
+    if guessed.startswith('text/'):
+        guessed += '; charset=utf-8'
+    return guessed
+
+
+def gzip_variant(data):
+    """Deterministic gzip of ``data`` (fixed mtime, so equal input gives an equal hash)"""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _walk(out_dir, prefix=''):
+    """Yield (relative path, absolute path) for every file under out_dir"""
+    with os.scandir(os.path.join(out_dir, prefix) if prefix else out_dir) as entries:
+        for entry in entries:
+            relative = f"{prefix}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(out_dir, relative + '/')
+            elif entry.is_file():
+                yield relative, entry.path
+
+
+def build_manifest(out_dir, previous=None):
+    """
+    Describe every file under out_dir. Compressed variants are reused from
+    ``previous`` for files whose hash has not changed, so only new or
+    changed files are compressed.
+    """
+    previous_files = (previous or {}).get('files', {})
+    files = {}
+    for relative, path in sorted(_walk(out_dir)):
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+
+        old = previous_files.get(relative)
+        if old is not None and old['sha256'] == digest:
+            files[relative] = old
+            continue
+
+        entry = {'sha256': digest, 'size': len(data), 'content_type': content_type(relative),
+                 'variants': {}}
+        if len(data) >= MIN_COMPRESS_SIZE and entry['content_type'].startswith(_COMPRESSIBLE_TYPES):
+            compressed = gzip_variant(data)
+            entry['variants']['gzip'] = {'sha256': hashlib.sha256(compressed).hexdigest(),
+                                         'size': len(compressed)}
+        files[relative] = entry
+    return {'version': MANIFEST_VERSION, 'files': files}
+
+
+def load_manifest(path):
+    """Read a manifest file, or return None if there is none"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def save_manifest(path, manifest):
+    """Write a manifest file atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(path + '.tmp', path)
+
+
+def update_manifest(data_dir, out_dir, save=True):
+    """Rebuild the build manifest for out_dir, reusing unchanged entries"""
+    path = os.path.join(data_dir, MANIFEST_FILE)
+    manifest = build_manifest(out_dir, load_manifest(path))
+    if save:
+        save_manifest(path, manifest)
+    return manifest
+
+
+def diff_manifests(new, old):
+    """Return (upload, delete) path lists taking ``old`` to ``new``"""
+    new_files = new['files']
+    old_files = (old or {}).get('files', {})
+    upload = sorted(path for path, entry in new_files.items()
+                    if path not in old_files or old_files[path]['sha256'] != entry['sha256'])
+    delete = sorted(path for path in old_files if path not in new_files)
+    return upload, delete
+
+
+class LocalDirectoryTarget:
+    """Mirror the site into a local directory, with .gz files next to compressible ones"""
+
+    def __init__(self, root):
+        self.root = root
+        self.manifest_path = os.path.join(root, '.' + MANIFEST_FILE)
+
+    def __str__(self):
+        return f"{self.root}/"
+
+    def read_manifest(self):
+        return load_manifest(self.manifest_path)
+
+    def upload(self, relative, source, entry):
+        destination = os.path.join(self.root, relative)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copyfile(source, destination)
+        if 'gzip' in entry['variants']:
+            with open(source, 'rb') as f:
+                data = f.read()
+            with open(destination + '.gz', 'wb') as f:
+                f.write(gzip_variant(data))
+        elif os.path.exists(destination + '.gz'):
+            os.remove(destination + '.gz')
+
+    def delete(self, relative):
+        for path in (os.path.join(self.root, relative), os.path.join(self.root, relative) + '.gz'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def write_manifest(self, manifest):
+        save_manifest(self.manifest_path, manifest)
+
+
+# Target adapters by scheme; a bare path means a local directory
+TARGETS = {
+    'dir': LocalDirectoryTarget,
+}
+
+
+def open_target(spec):
+    """Create a target from 'scheme:location' or a plain directory path"""
+    scheme, sep, location = spec.partition(':')
+    if sep and scheme in TARGETS:
+        if not location:
+            raise ValueError(f"publish target {spec!r} has no location")
+        return TARGETS[scheme](location)
+    if sep and len(scheme) > 1 and '/' not in scheme:
+        raise ValueError(f"unknown publish target {scheme!r} (known: {', '.join(sorted(TARGETS))})")
+    if not spec:
+        raise ValueError("publish target is empty")
+    return LocalDirectoryTarget(spec)
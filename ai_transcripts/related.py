@@ -0,0 +1,296 @@
+"""
+"Related episodes" recommendations from TF-IDF similarity
+
+Each episode becomes a document: its title (weighted up), description and
+transcript text. Tokenizing is the only per-episode Python work. Each
+episode's term ids and counts are cached as arrays under the cache directory,
+keyed by a hash of the episode's title, description and transcript file, so a
+rebuild only tokenizes new or edited episodes. The matrix is assembled from the
+cached arrays with ``np.concatenate``; weighting, trimming each episode to its
+MAX_TERMS heaviest terms and the all-pairs cosine similarity all run on whole
+arrays, the last two in row blocks to bound memory.
+
+The rankings themselves are cached too, keyed by every episode's hash, so a
+build where no episode changed (such as a render straight after a dry run)
+never imports NumPy or SciPy. Both are imported lazily so stages that do not
+build recommendations do not pay for them either.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+
+from . import store
+
+TERMS_FILE = 'related-terms.npz'
+RANKINGS_FILE = 'related.json'
+
+# Bump to invalidate cached term counts when tokenization changes
+_TOKENIZER_VERSION = '2'
+
+# Titles are short but say the most about an episode
+TITLE_WEIGHT = 3
+# Pairs less similar than this are not worth recommending
+MIN_SIMILARITY = 0.05
+# Terms kept per episode; a long transcript's tail of rare words adds cost, not signal
+MAX_TERMS = 200
+# Rows of the matrix processed per dense block
+BLOCK_ROWS = 512
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9']+")
+
+_STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been
+before being below between both but by can can't cannot could couldn't did didn't do does
+doesn't doing don't down during each few for from further get gets getting go going gonna
+got had hadn't has hasn't have haven't having he he'd he'll he's her here here's hers herself
+him himself his how how's i i'd i'll i'm i've if in into is isn't it it's its itself just
+kind know let's like lot me more most mustn't my myself no nor not now of off on once only or
+other ought our ours ourselves out over own really right same say says she she'd she'll
+she's should shouldn't so some such than that that's the their theirs them themselves then
+there there's these they they'd they'll they're they've thing things think this those
+through to too um uh under until up us very was wasn't we we'd we'll we're we've were
+weren't what what's when when's where where's which while who who's whom why why's will with
+won't would wouldn't yeah yes you you'd you'll you're you've your yours yourself yourselves
+""".split())
+
+
+def tokenize(text):
+    """Lower-case words of three or more characters, minus stopwords"""
+    return [word for word in _WORD_RE.findall(text.lower())
+            if len(word) > 2 and word not in _STOPWORDS]
+
+
+def _document(video, transcript):
+    parts = [video['title']] * TITLE_WEIGHT + [video['description']]
+    if transcript:
+        parts.extend(entry['text'] for entry in transcript)
+    return '\n'.join(parts)
+
+
+def document_digest(data_dir, video):
+    """
+    Hash of everything an episode's document is built from. The transcript
+    file is hashed as raw bytes, so unchanged episodes are never parsed.
+    """
+    digest = hashlib.sha256(f"{video['title']}\0{video['description']}\0".encode('utf-8'))
+    try:
+        with open(store.transcript_path(data_dir, video['video_id']), 'rb') as f:
+            digest.update(f.read())
+    except FileNotFoundError:
+        pass
+    return digest.hexdigest()
+
+
+def _load_terms(path):
+    """Return (vocabulary, {video_id: (digest, term_ids, counts)}) from the term cache"""
+    import numpy as np
+
+    try:
+        with np.load(path) as cache:
+            if str(cache['version']) != _TOKENIZER_VERSION:
+                return [], {}
+            vocabulary = str(cache['vocabulary'])
+            vocabulary = vocabulary.split('\n') if vocabulary else []
+            video_ids = str(cache['video_ids']).split('\n')
+            digests = str(cache['digests']).split('\n')
+            indptr, term_ids, counts = cache['indptr'], cache['term_ids'], cache['counts']
+    except (FileNotFoundError, KeyError, ValueError, OSError):
+        return [], {}
+    return vocabulary, {
+        video_id: (digest, term_ids[start:stop], counts[start:stop])
+        for video_id, digest, start, stop in zip(video_ids, digests, indptr[:-1], indptr[1:])
+    }
+
+
+def _save_terms(path, vocabulary, video_ids, digests, rows):
+    import numpy as np
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'wb') as f:
+        np.savez(
+            f,
+            version=np.array(_TOKENIZER_VERSION),
+            # Terms never contain whitespace, so one joined string stores them compactly
+            vocabulary=np.array('\n'.join(vocabulary)),
+            video_ids=np.array('\n'.join(video_ids)),
+            digests=np.array('\n'.join(digests)),
+            indptr=np.concatenate(([0], np.cumsum([len(ids) for ids, _ in rows]))),
+            term_ids=np.concatenate([ids for ids, _ in rows]),
+            counts=np.concatenate([counts for _, counts in rows]),
+        )
+    os.replace(path + '.tmp', path)
+
+
+def term_rows(data_dir, videos, digests, cache_dir=None):
+    """
+    Return (rows, vocabulary size), where rows holds one (term_ids, counts)
+    array pair per video. Cached rows are reused for episodes whose digest is
+    unchanged; the rest are tokenized and added to the cache.
+    """
+    import numpy as np
+
+    path = os.path.join(cache_dir, TERMS_FILE) if cache_dir else None
+    vocabulary, cached = _load_terms(path) if path else ([], {})
+    term_index = None
+
+    rows = []
+    tokenized = 0
+    for video, digest in zip(videos, digests):
+        entry = cached.get(video['video_id'])
+        if entry is not None and entry[0] == digest:
+            rows.append(entry[1:])
+            continue
+        if term_index is None:
+            term_index = {term: index for index, term in enumerate(vocabulary)}
+        transcript = store.load_transcript(data_dir, video['video_id'])
+        terms = Counter(tokenize(_document(video, transcript)))
+        # New terms are appended, so ids already in the cache stay valid
+        ids = [term_index.setdefault(term, len(term_index)) for term in terms]
+        rows.append((np.array(ids, dtype=np.int32), np.fromiter(terms.values(), np.int32, len(terms))))
+        tokenized += 1
+    if term_index is not None:
+        vocabulary = list(term_index)
+
+    if path and (tokenized or len(videos) != len(cached)):
+        _save_terms(path, vocabulary, [video['video_id'] for video in videos], digests, rows)
+    return rows, len(vocabulary)
+
+
+def _keep_heaviest(matrix, max_terms):
+    """
+    Zero all but the ``max_terms`` largest entries of each CSR row. Rows are
+    scattered into a zero-padded dense block so one ``np.partition`` finds
+    every row's cut-off at once; ties at the cut-off go to the earliest terms.
+    """
+    import numpy as np
+
+    keep = np.empty(matrix.nnz, dtype=bool)
+    for start in range(0, matrix.shape[0], BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, matrix.shape[0])
+        first, last = matrix.indptr[start], matrix.indptr[stop]
+        lengths = np.diff(matrix.indptr[start:stop + 1])
+        rows = np.repeat(np.arange(stop - start), lengths)
+        columns = np.arange(first, last) - np.repeat(matrix.indptr[start:stop], lengths)
+
+        width = max(lengths.max(initial=0), max_terms)
+        padded = np.zeros((stop - start, width), dtype=matrix.dtype)
+        padded.ravel()[rows * width + columns] = matrix.data[first:last]
+        # Weights are positive, so short rows get a cut-off of 0 and keep everything
+        cutoff = np.partition(padded, -max_terms, axis=1)[:, -max_terms][rows]
+        weights = matrix.data[first:last]
+        above = weights > cutoff
+        room = max_terms - np.bincount(rows[above], minlength=stop - start)
+        # Rank the (few) entries tied at the cut-off within their row and fill the room left
+        tied = np.flatnonzero(weights == cutoff)
+        tied_rows = rows[tied]
+        tied_rank = np.arange(len(tied)) - np.searchsorted(tied_rows, tied_rows)
+        above[tied[tied_rank < room[tied_rows]]] = True
+        keep[first:last] = above
+
+    matrix.data[~keep] = 0
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def tfidf_matrix(rows, n_terms, max_terms=MAX_TERMS):
+    """
+    Build the L2-normalised, sublinear TF-IDF matrix (episodes x terms) as
+    CSR from (term_ids, counts) rows, keeping at most ``max_terms`` terms per
+    episode
+    """
+    import numpy as np
+    from scipy import sparse
+
+    lengths = [len(ids) for ids, _ in rows]
+    indptr = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    indices = np.concatenate([ids for ids, _ in rows] or [np.zeros(0, np.int32)])
+    counts = np.concatenate([counts for _, counts in rows] or [np.zeros(0, np.int32)])
+    matrix = sparse.csr_matrix((np.log1p(counts, dtype=np.float32), indices, indptr),
+                               shape=(len(rows), n_terms))
+
+    # Smoothed inverse document frequency, as in scikit-learn
+    document_frequency = np.bincount(matrix.indices, minlength=n_terms)
+    idf = np.log((1 + matrix.shape[0]) / (1 + document_frequency)) + 1
+    matrix.data *= idf.astype(np.float32)[matrix.indices]
+    if max_terms:
+        matrix = _keep_heaviest(matrix, max_terms)
+
+    norms = np.sqrt(np.asarray(matrix.power(2).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    matrix.data /= np.repeat(norms, np.diff(matrix.indptr))
+    return matrix
+
+
+def top_related(matrix, count, min_similarity=MIN_SIMILARITY):
+    """
+    For each row, return the indices of the ``count`` most similar other rows
+    (cosine similarity, best first), computed block by block
+    """
+    import numpy as np
+
+    n = matrix.shape[0]
+    count = min(count, n - 1)
+    if count <= 0:
+        return [[] for _ in range(n)]
+
+    matrix = matrix.tocsr()
+    transposed = matrix.T.tocsc()
+    related = []
+    for start in range(0, n, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, n)
+        similarity = (matrix[start:stop] @ transposed).toarray()
+        rows = np.arange(stop - start)
+        similarity[rows, rows + start] = -1  # never recommend an episode to itself
+
+        best = np.argpartition(-similarity, count - 1, axis=1)[:, :count]
+        best_scores = np.take_along_axis(similarity, best, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+
+        for row_best, row_scores in zip(best.tolist(), best_scores.tolist()):
+            related.append([index for index, score in zip(row_best, row_scores) if score >= min_similarity])
+    return related
+
+
+def _load_rankings(path, key):
+    try:
+        with open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return cache['related'] if cache.get('key') == key else None
+
+
+def _save_rankings(path, key, related):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'related': related}, f, separators=(',', ':'))
+    os.replace(path + '.tmp', path)
+
+
+def related_episodes(data_dir, videos, count, cache_dir=None):
+    """Return {video_id: [related video dicts]} for the whole catalogue"""
+    if count <= 0 or len(videos) < 2:
+        return {}
+
+    digests = [document_digest(data_dir, video) for video in videos]
+    key = hashlib.sha256('\0'.join(
+        [_TOKENIZER_VERSION, str(count), str(MAX_TERMS), str(MIN_SIMILARITY)]
+        + [video['video_id'] for video in videos] + digests
+    ).encode('utf-8')).hexdigest()
+    path = os.path.join(cache_dir, RANKINGS_FILE) if cache_dir else None
+
+    indices = _load_rankings(path, key) if path else None
+    if indices is None:
+        rows, n_terms = term_rows(data_dir, videos, digests, cache_dir)
+        indices = top_related(tfidf_matrix(rows, n_terms), count)
+        if path:
+            _save_rankings(path, key, indices)
+    return {
+        video['video_id']: [videos[index] for index in row]
+        for video, row in zip(videos, indices)
+    }
@@ -0,0 +1,179 @@
+"""
+HTML generation for episode pages and the transcript index
+
+Markup lives in ``templates/``; see ``templating`` for the syntax. Templates
+are compiled once per run and their code objects cached under the cache
+directory, so regenerating the site does not re-parse them.
+"""
+
+import json
+import os
+from datetime import datetime
+
+from . import config
+from .markup import Markup
+from .templating import Environment
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'templates')
+# Subdirectory of the output directory holding deferred transcript sections
+FRAGMENT_DIR = 'parts'
+
+_environment = None
+
+
+def format_timestamp(seconds):
+    """Convert seconds to MM:SS format"""
+    mins = int(seconds // 60)
+    secs = int(seconds % 60)
+    return f"{mins:02d}:{secs:02d}"
+
+
+def format_date(published_at):
+    """Convert an ISO 8601 publish time to e.g. 'March 01, 2024'"""
+    pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+    return pub_date.strftime('%B %d, %Y')
+
+
+def episode_filename(video_id):
+    """Output filename for an episode page"""
+    return f"episode-{video_id}.html"
+
+
+def get_environment():
+    """Return the shared template environment, creating it on first use"""
+    global _environment
+    if _environment is None:
+        _environment = Environment(
+            TEMPLATE_DIR,
+            cache_dir=os.path.join(config.CACHE_DIR, 'templates'),
+            filters={
+                'pubdate': format_date,
+                'episode_filename': episode_filename,
+            }
+        )
+    return _environment
+
+
+def episode_schema(video):
+    """Build the PodcastEpisode JSON-LD block for an episode page"""
+    schema = {
+        "@context": "https://schema.org",
+        "@type": "PodcastEpisode",
+        "name": video['title'],
+        "description": f"{video['description'][:150]}...",
+        "datePublished": video['published_at'],
+        "url": f"https://www.youtube.com/watch?v={video['video_id']}",
+        "thumbnailUrl": video['thumbnail'],
+        "partOfSeries": {
+            "@type": "PodcastSeries",
+            "name": "Artificial Insanity",
+            "url": "https://artificialinsanity.com"
+        }
+    }
+    # json.dumps handles quoting; "</" would still close the <script> element early
+    return Markup(json.dumps(schema, ensure_ascii=False, indent=4).replace('</', '<\\/').replace('\n', '\n    '))
+
+
+def transcript_lines(transcript):
+    """Pair each segment's timestamp with its text (escaped by the template)"""
+    if not transcript:
+        return []
+    return [(format_timestamp(entry['start']), entry['text']) for entry in transcript]
+
+
+def split_transcript(transcript, chunk_seconds):
+    """
+    Group segments into consecutive ``chunk_seconds``-long sections.
+    Returns a list of (number, start_seconds, segments); sections with no
+    speech are skipped, so numbers can have gaps.
+    """
+    chunks = []
+    for entry in transcript:
+        number = int(entry['start'] // chunk_seconds) + 1
+        if not chunks or chunks[-1][0] != number:
+            chunks.append((number, (number - 1) * chunk_seconds, []))
+        chunks[-1][2].append(entry)
+    return chunks
+
+
+def fragment_path(video_id, number):
+    """Path, relative to the output directory, of one deferred transcript section"""
+    return f"{FRAGMENT_DIR}/{video_id}-{number}.html"
+
+
+def _chunks(transcript, chunk_seconds):
+    """Transcript sections when chunking applies, otherwise []"""
+    if not transcript or not chunk_seconds:
+        return []
+    chunks = split_transcript(transcript, chunk_seconds)
+    return chunks if len(chunks) > 1 else []
+
+
+def _episode_context(video, transcript, chunk_seconds, related):
+    chunks = _chunks(transcript, chunk_seconds)
+    if chunks:
+        first_number, first_start, first_segments = chunks[0]
+        first_chunk = {'number': first_number, 'label': format_timestamp(first_start)}
+        lines = transcript_lines(first_segments)
+    else:
+        first_chunk = None
+        lines = transcript_lines(transcript)
+    deferred = [
+        {
+            'number': number,
+            'label': format_timestamp(start),
+            'src': fragment_path(video['video_id'], number),
+            # Reserve roughly the space the section will take so the page does not jump
+            'min_height': round(len(segments) * 2.1, 1),
+        }
+        for number, start, segments in chunks[1:]
+    ]
+    return {
+        'video': video,
+        'lines': lines,
+        'first_chunk': first_chunk,
+        'chunks': deferred,
+        'related': related or [],
+        'schema_json': episode_schema(video),
+    }
+
+
+def generate_episode_page(video, transcript, chunk_seconds=0, related=None):
+    """
+    Generate HTML page for individual episode. With ``chunk_seconds`` set,
+    only the first section of a long transcript is inlined; the rest are
+    placeholders filled from ``episode_fragments()`` as the reader scrolls.
+    ``related`` is a list of video dicts to link at the end of the page.
+    """
+    template = get_environment().get_template('episode.html')
+    return template.render(**_episode_context(video, transcript, chunk_seconds, related))
+
+
+def write_episode_page(f, video, transcript, chunk_seconds=0, related=None):
+    """Stream an episode page into an open text file"""
+    template = get_environment().get_template('episode.html')
+    template.render_to(f.write, **_episode_context(video, transcript, chunk_seconds, related))
+
+
+def episode_fragments(video, transcript, chunk_seconds):
+    """Return (path, html) for each deferred transcript section of an episode"""
+    template = get_environment().get_template('fragment.html')
+    return [
+        (fragment_path(video['video_id'], number), template.render(lines=transcript_lines(segments)))
+        for number, _, segments in _chunks(transcript, chunk_seconds)[1:]
+    ]
+
+
+def generate_index_page(videos):
+    """Generate main index page listing all episodes"""
+    return get_environment().get_template('index.html').render(videos=videos)
+
+
+def generate_tombstone_page():
+    """Generate the placeholder left behind for an episode that is no longer listed"""
+    return get_environment().get_template('tombstone.html').render()
+
+
+def write_index_page(f, videos):
+    """Stream the index page into an open text file"""
+    get_environment().get_template('index.html').render_to(f.write, videos=videos)
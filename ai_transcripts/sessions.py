@@ -0,0 +1,49 @@
+"""
+Shared HTTP sessions for the network stages
+
+One pooled keep-alive session is created per run and handed to every
+transcript request, so TLS handshakes are paid once per host rather than
+once per episode. ``requests`` is imported lazily like the other clients.
+"""
+
+DEFAULT_POOL_SIZE = 4
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE, proxy=None):
+    """Return a requests.Session with keep-alive pools of ``pool_size`` connections per host"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if proxy:
+        session.proxies.update({'http': proxy, 'https': proxy})
+    return session
+
+
+def connection_stats(session):
+    """
+    Return (requests, connections) summed over the session's connection pools.
+    Every request beyond the number of connections reused a kept-alive socket.
+    """
+    requests_made = 0
+    connections = 0
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        managers = [adapter.poolmanager] + list(adapter.proxy_manager.values())
+        for manager in managers:
+            for key in manager.pools.keys():
+                pool = manager.pools[key]
+                requests_made += pool.num_requests
+                connections += pool.num_connections
+    return requests_made, connections
+
+
+def print_connection_stats(session):
+    """Print how many requests reused a pooled connection"""
+    requests_made, connections = connection_stats(session)
+    if requests_made:
+        print(f"🔌 HTTP: {requests_made} requests over {connections} connections "
+              f"({requests_made - connections} reused)")
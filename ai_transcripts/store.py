@@ -0,0 +1,65 @@
+"""
+On-disk cache for the channel catalogue and fetched transcripts
+
+Layout under the data directory:
+    catalogue.json            list of video dicts from the last listing
+    transcripts/<id>.json     transcript segments for one video
+"""
+
+import json
+import os
+
+CATALOGUE_FILE = 'catalogue.json'
+TRANSCRIPTS_SUBDIR = 'transcripts'
+
+
+def _write_json(path, data, indent=None):
+    """Write JSON atomically so an interrupted run never leaves a torn file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def load_catalogue(data_dir):
+    """Return the cached video list, or an empty list if nothing is cached"""
+    try:
+        with open(os.path.join(data_dir, CATALOGUE_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def save_catalogue(data_dir, videos):
+    """Persist the listed video catalogue"""
+    _write_json(os.path.join(data_dir, CATALOGUE_FILE), videos, indent=2)
+
+
+def transcript_path(data_dir, video_id):
+    """Path of the cached transcript for a video"""
+    return os.path.join(data_dir, TRANSCRIPTS_SUBDIR, f"{video_id}.json")
+
+
+def load_transcript(data_dir, video_id):
+    """Return cached transcript segments, or None if none were fetched"""
+    try:
+        with open(transcript_path(data_dir, video_id), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_transcript(data_dir, video_id, transcript):
+    """Persist transcript segments for a video"""
+    _write_json(transcript_path(data_dir, video_id), transcript)
+
+
+def cached_transcript_ids(data_dir):
+    """Return the set of video ids with a cached transcript (one directory scan)"""
+    try:
+        with os.scandir(os.path.join(data_dir, TRANSCRIPTS_SUBDIR)) as entries:
+            return {entry.name[:-5] for entry in entries if entry.name.endswith('.json')}
+    except FileNotFoundError:
+        return set()
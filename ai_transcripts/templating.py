@@ -0,0 +1,304 @@
+"""
+Minimal Jinja-style template compiler
+
+Supported syntax:
+    {{ expr }}                  output, HTML-escaped unless the last filter is ``safe``
+    {{ expr|name(arg) }}        filters registered on the Environment
+    {% for x in expr %}         ... {% endfor %}
+    {% if expr %}               ... {% elif expr %} ... {% else %} ... {% endif %}
+    {% set name = expr %}
+    {# comment #}
+
+Expressions are plain Python. Block tags and comments swallow the indentation
+before them and the newline after them, so templates can be laid out readably.
+
+Each template is translated to Python source once, compiled to a code object
+and cached in memory for the rest of the run. When a cache directory is
+configured the code object is also marshalled to disk, keyed by a hash of the
+template source, so later runs skip parsing entirely. Rendering writes through
+a callback, so pages can be streamed straight into a file.
+"""
+
+import ast
+import builtins
+import hashlib
+import importlib.util
+import marshal
+import os
+import re
+
+from .markup import escape
+
+# Bump whenever the generated code changes shape, to invalidate disk caches
+_COMPILER_VERSION = '2'
+
+_TOKEN_RE = re.compile(r'(\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\})', re.S)
+_FOR_RE = re.compile(r'for\s+(.+?)\s+in\s+(.+)$', re.S)
+_SET_RE = re.compile(r'set\s+([A-Za-z_]\w*)\s*=\s*(.+)$', re.S)
+
+
+class TemplateError(Exception):
+    """Raised for template syntax errors and undefined variables"""
+
+
+def _lookup(ctx, name):
+    """Resolve a template variable from the context, falling back to builtins"""
+    try:
+        return ctx[name]
+    except KeyError:
+        pass
+    try:
+        return getattr(builtins, name)
+    except AttributeError:
+        raise TemplateError(f"undefined template variable {name!r}") from None
+
+
+class _Compiler:
+    """Translate template source into the source of a ``render(_ctx, _w)`` function"""
+
+    def __init__(self, name, filter_names):
+        self.name = name
+        self.filter_names = filter_names
+        self.lines = []
+        self.pending = []
+        self.stack = []
+        self.loaded = set()
+        self.bound = set()
+        self.indent = 1
+
+    def error(self, message, lineno):
+        return TemplateError(f"{self.name}:{lineno}: {message}")
+
+    def emit(self, line):
+        self.lines.append('    ' * self.indent + line)
+
+    def flush(self):
+        """Write pending output parts with a single %-format and a single call"""
+        if not self.pending:
+            return
+        exprs = [code for is_literal, code in self.pending if not is_literal]
+        if not exprs:
+            self.emit(f"_w({''.join(code for _, code in self.pending)!r})")
+        else:
+            fmt = ''.join(code.replace('%', '%%') if is_literal else '%s' for is_literal, code in self.pending)
+            self.emit(f"_w({fmt!r} % ({', '.join(exprs)},))")
+        self.pending = []
+
+    def expression(self, source, lineno):
+        """Compile an expression with filters; return (code, is_safe)"""
+        try:
+            node = ast.parse(source.strip(), mode='eval').body
+        except SyntaxError as e:
+            raise self.error(f"invalid expression {source.strip()!r}: {e.msg}", lineno) from None
+
+        filters = []
+        while isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            right = node.right
+            func = right.func if isinstance(right, ast.Call) else right
+            if not isinstance(func, ast.Name) or func.id not in self.filter_names:
+                break
+            filters.append(right)
+            node = node.left
+
+        operands = [node] + [arg for f in filters if isinstance(f, ast.Call) for arg in f.args]
+        for operand in operands:
+            for sub in ast.walk(operand):
+                if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Load):
+                    self.loaded.add(sub.id)
+
+        code = ast.unparse(node)
+        is_safe = False
+        for f in reversed(filters):
+            if isinstance(f, ast.Call):
+                args = ''.join(', ' + ast.unparse(arg) for arg in f.args)
+                code = f"_f_{f.func.id}({code}{args})"
+            elif f.id == 'safe':
+                code = f"str({code})"
+            else:
+                code = f"_f_{f.id}({code})"
+            is_safe = not isinstance(f, ast.Call) and f.id == 'safe'
+        return code, is_safe
+
+    def statement(self, source, lineno):
+        keyword = source.split(None, 1)[0] if source else ''
+        if keyword == 'for':
+            match = _FOR_RE.match(source)
+            if not match:
+                raise self.error(f"malformed for tag {source!r}", lineno)
+            target, iterable = match.groups()
+            try:
+                target_node = ast.parse(target, mode='eval').body
+            except SyntaxError:
+                raise self.error(f"invalid loop target {target!r}", lineno) from None
+            self.bound.update(n.id for n in ast.walk(target_node) if isinstance(n, ast.Name))
+            code, _ = self.expression(iterable, lineno)
+            self.flush()
+            self.emit(f"for {target} in {code}:")
+            self.stack.append(('for', lineno))
+            self.indent += 1
+        elif keyword == 'if':
+            code, _ = self.expression(source[2:], lineno)
+            self.flush()
+            self.emit(f"if {code}:")
+            self.stack.append(('if', lineno))
+            self.indent += 1
+        elif keyword in ('elif', 'else'):
+            if not self.stack or self.stack[-1][0] != 'if':
+                raise self.error(f"unexpected {keyword}", lineno)
+            self.flush()
+            self.emit('pass')
+            self.indent -= 1
+            if keyword == 'elif':
+                code, _ = self.expression(source[4:], lineno)
+                self.emit(f"elif {code}:")
+            else:
+                self.emit('else:')
+            self.indent += 1
+        elif keyword in ('endfor', 'endif'):
+            if not self.stack or self.stack[-1][0] != keyword[3:]:
+                raise self.error(f"unexpected {keyword}", lineno)
+            self.flush()
+            self.emit('pass')
+            self.stack.pop()
+            self.indent -= 1
+        elif keyword == 'set':
+            match = _SET_RE.match(source)
+            if not match:
+                raise self.error(f"malformed set tag {source!r}", lineno)
+            name, value = match.groups()
+            code, _ = self.expression(value, lineno)
+            self.flush()
+            self.emit(f"{name} = {code}")
+            self.bound.add(name)
+        else:
+            raise self.error(f"unknown tag {keyword!r}", lineno)
+
+    def compile(self, source):
+        tokens = _TOKEN_RE.split(source)
+        lineno = 1
+        for i, token in enumerate(tokens):
+            if i % 2 == 0:
+                text = token
+                at_line_start = i == 0
+                # Drop the newline after a block tag or comment and the indentation before one
+                if i > 0 and tokens[i - 1].startswith(('{%', '{#')) and text.startswith('\n'):
+                    text = text[1:]
+                    at_line_start = True
+                if i + 1 < len(tokens) and tokens[i + 1].startswith(('{%', '{#')):
+                    head, newline, tail = text.rpartition('\n')
+                    if not tail.strip() and (newline or at_line_start):
+                        text = head + newline
+                if text:
+                    self.pending.append((True, text))
+            elif token.startswith('{{'):
+                code, is_safe = self.expression(token[2:-2], lineno)
+                self.pending.append((False, code if is_safe else f"_escape({code})"))
+            elif token.startswith('{%'):
+                self.statement(token[2:-2].strip(), lineno)
+            lineno += token.count('\n')
+
+        if self.stack:
+            keyword, start = self.stack[-1]
+            raise self.error(f"unclosed {keyword} tag", start)
+        self.flush()
+
+        header = ['def render(_ctx, _w):']
+        for name in sorted(self.loaded - self.bound):
+            header.append(f"    {name} = _lookup(_ctx, {name!r})")
+        return '\n'.join(header + self.lines + ['    return None', ''])
+
+
+class Template:
+    """A compiled template"""
+
+    def __init__(self, name, render_func):
+        self.name = name
+        self._render = render_func
+
+    def render(self, **context):
+        """Render to a string"""
+        parts = []
+        self._render(context, parts.append)
+        return ''.join(parts)
+
+    def render_to(self, write, **context):
+        """Stream rendered output through ``write`` (e.g. a file's write method)"""
+        self._render(context, write)
+
+
+class Environment:
+    """Loads templates from a directory, compiling each one at most once per run"""
+
+    def __init__(self, template_dir, cache_dir=None, filters=None):
+        self.template_dir = template_dir
+        self.cache_dir = cache_dir
+        self.filters = dict(filters or {})
+        self._templates = {}
+
+    def get_template(self, name):
+        """Return the compiled template called ``name``"""
+        template = self._templates.get(name)
+        if template is None:
+            with open(os.path.join(self.template_dir, name), encoding='utf-8') as f:
+                source = f.read()
+            template = self._templates[name] = self._build(name, source)
+        return template
+
+    def invalidate(self, name=None):
+        """
+        Forget the compiled template ``name`` (or all of them) so the next
+        ``get_template`` re-reads it; used when watching for edits
+        """
+        if name is None:
+            self._templates.clear()
+        else:
+            self._templates.pop(name, None)
+
+    def _build(self, name, source):
+        filter_names = sorted(set(self.filters) | {'safe'})
+        key = hashlib.sha256('\0'.join(
+            [_COMPILER_VERSION, name, source] + filter_names
+        ).encode('utf-8')).hexdigest()[:16]
+
+        code = self._load_cached(name, key)
+        if code is None:
+            python_source = _Compiler(name, filter_names).compile(source)
+            code = compile(python_source, f"<template {name}>", 'exec')
+            self._store_cached(name, key, code)
+
+        namespace = {'_lookup': _lookup, '_escape': escape}
+        namespace.update((f"_f_{fname}", func) for fname, func in self.filters.items())
+        exec(code, namespace)
+        return Template(name, namespace['render'])
+
+    def _cache_path(self, name, key):
+        return os.path.join(self.cache_dir, f"{name}.{key}.bin")
+
+    def _load_cached(self, name, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(name, key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        magic = importlib.util.MAGIC_NUMBER
+        if not data.startswith(magic):
+            return None
+        try:
+            return marshal.loads(data[len(magic):])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _store_cached(self, name, key, code):
+        if not self.cache_dir:
+            return
+        path = self._cache_path(name, key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(importlib.util.MAGIC_NUMBER + marshal.dumps(code))
+            os.replace(path + '.tmp', path)
+        except OSError:
+            # The disk cache is an optimisation only; a read-only tree still renders
+            pass
@@ -0,0 +1,230 @@
+"""
+Watch mode: rebuild only the outputs affected by each edit
+
+Polls the templates and the data cache and maps each changed input to the
+outputs that depend on it:
+
+    episode.html          every episode page
+    fragment.html         every deferred transcript section
+    index.html            the index
+    tombstone.html        tombstoned pages (with --orphans tombstone)
+    transcripts/<id>      that episode's page and sections
+    catalogue.json        the index, pages of added or edited episodes, pages
+                          whose related-episodes list changed, and pruning of
+                          removed or no longer public episodes
+
+so editing one transcript re-renders one page whatever the size of the
+catalogue. Related episodes are re-ranked when the catalogue changes; a
+transcript edit keeps the episode's current list until then. Nothing touches
+the network, and the publish manifest is left for ``publish`` to refresh.
+"""
+
+import functools
+import os
+import time
+from threading import Thread
+
+from . import config, store
+from .pipeline import (build_related, find_stale_fragments, is_public, prune_orphans,
+                       warn_empty_catalogue, write_episode, write_fragments)
+from .render import FRAGMENT_DIR, TEMPLATE_DIR, get_environment, write_index_page
+
+# Seconds between scans; a scan is one stat per watched file
+POLL_INTERVAL = 0.3
+
+# Which outputs each template renders; any other template rebuilds everything
+TEMPLATE_OUTPUTS = {
+    'episode.html': {'pages'},
+    'fragment.html': {'fragments'},
+    'index.html': {'index'},
+    'tombstone.html': {'tombstones'},
+}
+ALL_OUTPUTS = {'pages', 'fragments', 'index', 'tombstones'}
+
+
+def _scan_dir(directory, suffix):
+    """{name: (mtime_ns, size)} for the files in directory ending in suffix"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: (stat.st_mtime_ns, stat.st_size)
+                    for entry in entries if entry.name.endswith(suffix)
+                    for stat in (entry.stat(),)}
+    except FileNotFoundError:
+        return {}
+
+
+def _sections_on_disk(out_dir):
+    """{video_id: {path, ...}} for the deferred sections currently in out_dir"""
+    sections = {}
+    for name in _scan_dir(os.path.join(out_dir, FRAGMENT_DIR), '.html'):
+        video_id, _, number = name[:-5].rpartition('-')
+        if video_id and number.isdigit():
+            sections.setdefault(video_id, set()).add(f"{FRAGMENT_DIR}/{name}")
+    return sections
+
+
+class Watcher:
+    """Tracks the watched inputs and rebuilds the outputs that depend on changed ones"""
+
+    def __init__(self, data_dir, out_dir, orphans='delete', chunk_seconds=0, related_count=0):
+        self.data_dir = data_dir
+        self.out_dir = out_dir
+        self.orphans = orphans
+        self.chunk_seconds = chunk_seconds
+        self.related_count = related_count
+        self.catalogue = []
+        self.videos = []
+        self.related = {}
+        self.inputs = {}
+        self.failed = set()
+
+    def scan(self):
+        """Signature of every watched input, keyed by (kind, name)"""
+        inputs = {('template', name): signature
+                  for name, signature in _scan_dir(TEMPLATE_DIR, '.html').items()}
+        inputs.update((('transcript', name[:-5]), signature) for name, signature in _scan_dir(
+            os.path.join(self.data_dir, store.TRANSCRIPTS_SUBDIR), '.json').items())
+        try:
+            stat = os.stat(os.path.join(self.data_dir, store.CATALOGUE_FILE))
+        except FileNotFoundError:
+            return inputs
+        inputs[('catalogue', store.CATALOGUE_FILE)] = (stat.st_mtime_ns, stat.st_size)
+        return inputs
+
+    def poll(self):
+        """Rebuild whatever changed since the last poll; return the number of files written"""
+        inputs = self.scan()
+        changed = {key for key in self.inputs.keys() | inputs.keys()
+                   if self.inputs.get(key) != inputs.get(key)}
+        # Retry inputs whose last rebuild failed along with anything new
+        changed |= self.failed
+        self.inputs = inputs
+        if not changed:
+            return 0
+
+        start = time.perf_counter()
+        try:
+            written = self.rebuild(changed)
+        except Exception as e:
+            # A half-edited template must not end the session; the next save retries
+            self.failed = changed
+            print(f"✗ Rebuild failed: {type(e).__name__}: {e}")
+            return 0
+        self.failed = set()
+
+        names = sorted(name for _, name in changed)
+        label = ', '.join(names[:3]) + (f" and {len(names) - 3} more" if len(names) > 3 else '')
+        print(f"✓ Rebuilt {written} files for {label} in "
+              f"{(time.perf_counter() - start) * 1e3:.0f} ms")
+        return written
+
+    def rebuild(self, changed):
+        """Rebuild the outputs that depend on the ``changed`` input keys"""
+        environment = get_environment()
+        outputs = set()
+        for kind, name in changed:
+            if kind == 'template':
+                environment.invalidate(name)
+                outputs |= TEMPLATE_OUTPUTS.get(name, ALL_OUTPUTS)
+
+        # A transcript change can move the chunk boundaries, so page and sections go together
+        sections = {name for kind, name in changed if kind == 'transcript'}
+        pages = set(sections)
+        removed = set()
+        # New state is only kept once everything is written, so a failed rebuild is redone in full
+        catalogue, videos, related = self.catalogue, self.videos, self.related
+        if ('catalogue', store.CATALOGUE_FILE) in changed:
+            catalogue = store.load_catalogue(self.data_dir)
+            videos = [video for video in catalogue if is_public(video)]
+            related = build_related(self.data_dir, videos, self.related_count)
+            previous = {video['video_id']: video for video in self.videos}
+            sections.update(video['video_id'] for video in videos
+                            if video['video_id'] not in previous)
+            pages.update(
+                video['video_id'] for video in videos
+                if previous.get(video['video_id']) != video
+                or self.related.get(video['video_id']) != related.get(video['video_id'])
+            )
+            if videos != self.videos:
+                outputs.add('index')
+            removed = previous.keys() - {video['video_id'] for video in videos}
+            if removed or not previous:
+                outputs.add('orphans')
+        if not catalogue:
+            warn_empty_catalogue(self.data_dir)
+            return 0
+
+        listed = [video['video_id'] for video in videos]
+        if 'pages' in outputs:
+            pages.update(listed)
+        if 'fragments' in outputs:
+            sections.update(listed)
+
+        written = 0
+        expected = set()
+        on_disk = _sections_on_disk(self.out_dir) if sections or removed else {}
+        for video in videos:
+            video_id = video['video_id']
+            if video_id not in pages and video_id not in sections:
+                continue
+            transcript = store.load_transcript(self.data_dir, video_id)
+            if video_id in pages:
+                write_episode(self.out_dir, video, transcript, self.chunk_seconds,
+                              related.get(video_id))
+                written += 1
+            if video_id in sections:
+                paths = write_fragments(self.out_dir, video, transcript, self.chunk_seconds)
+                for path in on_disk.get(video_id, set()) - set(paths):
+                    os.remove(os.path.join(self.out_dir, path))
+                written += len(paths)
+                expected.update(paths)
+
+        if 'index' in outputs:
+            with open(os.path.join(self.out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+                write_index_page(f, videos)
+            written += 1
+
+        if 'orphans' in outputs or ('tombstones' in outputs and self.orphans == 'tombstone'):
+            written += len(prune_orphans(self.out_dir, catalogue, self.orphans))
+        for video_id in removed:
+            for path in on_disk.get(video_id, ()):
+                os.remove(os.path.join(self.out_dir, path))
+        if sections >= set(listed):
+            # Every section was just rewritten, so anything else in the directory is stale
+            for path in find_stale_fragments(self.out_dir, expected):
+                os.remove(os.path.join(self.out_dir, path))
+
+        self.catalogue, self.videos, self.related = catalogue, videos, related
+        return written
+
+
+def serve(out_dir, port=config.SERVE_PORT):
+    """Serve out_dir on localhost from a background thread; return the server"""
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=out_dir)
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def watch(data_dir, out_dir, orphans='delete', chunk_seconds=0, related_count=0, port=None,
+          interval=POLL_INTERVAL):
+    """Build once, then rebuild affected outputs on every change until interrupted"""
+    os.makedirs(out_dir, exist_ok=True)
+    watcher = Watcher(data_dir, out_dir, orphans, chunk_seconds, related_count)
+    watcher.poll()
+
+    server = serve(out_dir, port) if port else None
+    if server:
+        print(f"🌐 Serving {out_dir}/ at http://127.0.0.1:{server.server_address[1]}/")
+    print(f"👀 Watching templates and {data_dir}/ for changes (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            watcher.poll()
+    except KeyboardInterrupt:
+        print("\n✓ Stopped watching")
+    finally:
+        if server:
+            server.shutdown()
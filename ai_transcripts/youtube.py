@@ -0,0 +1,153 @@
+"""
+YouTube Data API and transcript clients
+
+The Google and transcript client libraries are slow to import, so they are
+imported inside the functions that need them rather than at module load.
+"""
+
+import time
+
+
+def get_channel_videos(api_key, channel_id):
+    """Fetch all videos from the YouTube channel"""
+    from googleapiclient.discovery import build
+
+    youtube = build('youtube', 'v3', developerKey=api_key)
+
+    # Get uploads playlist
+    channel_response = youtube.channels().list(
+        part='contentDetails',
+        id=channel_id
+    ).execute()
+
+    uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+
+    videos = []
+    next_page_token = None
+
+    while True:
+        # Get videos from uploads playlist
+        playlist_response = youtube.playlistItems().list(
+            part='snippet',
+            playlistId=uploads_playlist_id,
+            maxResults=50,
+            pageToken=next_page_token
+        ).execute()
+
+        for item in playlist_response['items']:
+            snippet = item['snippet']
+            videos.append({
+                'video_id': snippet['resourceId']['videoId'],
+                'title': snippet['title'],
+                'description': snippet['description'],
+                'published_at': snippet['publishedAt'],
+                'thumbnail': snippet['thumbnails']['high']['url']
+            })
+
+        next_page_token = playlist_response.get('nextPageToken')
+        if not next_page_token:
+            break
+
+    return videos
+
+
+# Keys get_video_details() adds to each video dict
+DETAIL_KEYS = ('duration', 'has_captions', 'privacy_status', 'upload_status', 'live_broadcast')
+
+# videos.list accepts at most 50 ids per call; each call costs one quota unit
+VIDEOS_PER_REQUEST = 50
+
+
+def get_video_details(api_key, video_ids):
+    """
+    Fetch duration, caption flag and status for many videos, 50 ids per call.
+    Returns {video_id: details}; ids the API does not return (deleted, or
+    private to an API-key client) are reported as 'unavailable'.
+    """
+    from googleapiclient.discovery import build
+
+    youtube = build('youtube', 'v3', developerKey=api_key)
+
+    details = {}
+    for start in range(0, len(video_ids), VIDEOS_PER_REQUEST):
+        chunk = video_ids[start:start + VIDEOS_PER_REQUEST]
+        response = youtube.videos().list(
+            part='contentDetails,status,snippet',
+            id=','.join(chunk),
+            fields='items(id,contentDetails(duration,caption),'
+                   'status(privacyStatus,uploadStatus),snippet/liveBroadcastContent)'
+        ).execute()
+
+        for item in response.get('items', []):
+            details[item['id']] = {
+                'duration': item['contentDetails']['duration'],
+                # Only reflects uploaded caption tracks, not auto-generated ones
+                'has_captions': item['contentDetails']['caption'] == 'true',
+                'privacy_status': item['status']['privacyStatus'],
+                'upload_status': item['status']['uploadStatus'],
+                'live_broadcast': item['snippet']['liveBroadcastContent'],
+            }
+
+    for video_id in video_ids:
+        details.setdefault(video_id, {
+            'duration': None,
+            'has_captions': False,
+            'privacy_status': 'unavailable',
+            'upload_status': None,
+            'live_broadcast': None,
+        })
+    return details
+
+
+def _fetch_transcript(video_id, session):
+    """Fetch English captions, reusing ``session``'s connections when one is given"""
+    if session is None:
+        from youtube_transcript_api import YouTubeTranscriptApi
+        return YouTubeTranscriptApi.get_transcript(video_id)
+
+    # YouTubeTranscriptApi.get_transcript() opens a fresh requests.Session per
+    # call; drive the fetcher directly so every video shares one pool instead
+    from youtube_transcript_api._transcripts import TranscriptListFetcher
+    return TranscriptListFetcher(session).fetch(video_id).find_transcript(('en',)).fetch()
+
+
+def get_transcript(video_id, retry_count=2, session=None):
+    """
+    Fetch transcript for a video with retry logic
+    to handle intermittent blocking from GitHub Actions
+    """
+    from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
+
+    for attempt in range(retry_count):
+        try:
+            if attempt > 0:
+                print(f"  Retry {attempt}/{retry_count - 1} for {video_id}...")
+                time.sleep(3)  # Brief delay between retries
+
+            # Attempt to get transcript
+            transcript_list = _fetch_transcript(video_id, session)
+
+            if transcript_list:
+                print(f"  ✓ Successfully retrieved transcript ({len(transcript_list)} segments)")
+                return transcript_list
+
+        except TranscriptsDisabled:
+            print(f"  ⚠ Transcripts are disabled for this video")
+            return None
+        except NoTranscriptFound:
+            print(f"  ⚠ No transcript found (captions may not be enabled yet)")
+            return None
+        except Exception as e:
+            if "Too Many Requests" in str(e) or "429" in str(e):
+                if attempt < retry_count - 1:
+                    print(f"  ⚠ Rate limited, waiting before retry...")
+                    time.sleep(5)
+                    continue
+            if attempt < retry_count - 1:
+                print(f"  ⚠ Error on attempt {attempt + 1}: {str(e)[:100]}")
+                continue
+            else:
+                print(f"  ✗ Failed after {retry_count} attempts")
+                return None
+
+    return None
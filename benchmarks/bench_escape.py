@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+HTML escaping micro-benchmark over the real caption corpus
+
+    python benchmarks/bench_escape.py [--data-dir DIR] [--pages DIR] [--repeat N]
+
+Reads every caption segment from the transcript cache (data/transcripts/*.json)
+when it exists. Without a cache it falls back to the visible text nodes of the
+generated pages (unescaped back to raw text), which only covers titles,
+descriptions and boilerplate while pages still show the "not yet available"
+placeholder. The corpus is escaped with:
+
+    replace-chain   the old per-field .replace('<', ...).replace('>', ...)
+    html.escape     the standard library, one call per text
+    escape          ai_transcripts.markup.escape, one call per text
+    escape-joined   escape once per episode over its texts joined with \\0,
+                    then split back into segments
+
+The old replace chain is included for reference only: it skips &, so its
+output is not correct HTML.
+"""
+
+import argparse
+import glob
+import html
+import json
+import os
+import sys
+import timeit
+from html.parser import HTMLParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ai_transcripts.markup import escape  # noqa: E402
+
+
+class _TextCollector(HTMLParser):
+    """Collect the text nodes outside <style> and <script>"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.texts = []
+        self._skip = False
+
+    def handle_starttag(self, tag, attrs):
+        self._skip = tag in ('style', 'script')
+
+    def handle_endtag(self, tag):
+        self._skip = False
+
+    def handle_data(self, data):
+        if not self._skip and data.strip():
+            self.texts.append(data)
+
+
+def load_captions(data_dir):
+    """Return one list of caption texts per cached transcript"""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(data_dir, 'transcripts', '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            corpus.append([entry['text'] for entry in json.load(f)])
+    return corpus
+
+
+def load_page_texts(pages_dir):
+    """Return one list of raw text nodes per page"""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+        parser = _TextCollector()
+        with open(path, encoding='utf-8') as f:
+            parser.feed(f.read())
+        corpus.append(parser.texts)
+    return corpus
+
+
+def replace_chain(text):
+    return text.replace('<', '&lt;').replace('>', '&gt;')
+
+
+def escape_joined(texts):
+    """Escape a page's texts in one call; none of them contain \\0"""
+    return escape('\0'.join(texts)).split('\0')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data-dir', default=os.path.join(ROOT, 'data'))
+    parser.add_argument('--pages', default=os.path.join(ROOT, 'transcriptions'))
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = load_captions(args.data_dir)
+    source = f"captions from {args.data_dir}"
+    if not corpus:
+        corpus = load_page_texts(args.pages)
+        source = f"page text from {args.pages} (no transcript cache; captions not covered)"
+    texts = [text for page in corpus for text in page]
+    if not texts:
+        raise SystemExit(f"no transcripts in {args.data_dir} and no pages in {args.pages}")
+    dirty = sum(1 for text in texts if escape(text) is not text)
+    print(f"{source}\n{len(corpus)} documents, {len(texts)} texts, {sum(map(len, texts))} chars, "
+          f"{dirty} texts need escaping\n")
+
+    # escape must agree with the standard library (which spells ' as &#x27;)
+    def reference(text):
+        return html.escape(text).replace('&#x27;', '&#39;')
+
+    assert [escape(text) for text in texts] == [reference(text) for text in texts]
+    assert [text for page in corpus for text in escape_joined(page)] == \
+        [reference(text) for text in texts]
+
+    cases = [
+        ('replace-chain', lambda: [replace_chain(text) for text in texts]),
+        ('html.escape', lambda: [html.escape(text) for text in texts]),
+        ('escape', lambda: [escape(text) for text in texts]),
+        ('escape-joined', lambda: [escape_joined(page) for page in corpus]),
+    ]
+    baseline = None
+    for label, func in cases:
+        best = min(timeit.repeat(func, repeat=args.repeat, number=20)) / 20
+        baseline = baseline or best
+        print(f"{label:<15}{best * 1e3:>9.3f} ms{best / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Per-page render time: compiled templates vs the old inline f-strings
+
+    python benchmarks/bench_render.py [--segments N] [--episodes N] [--repeat N]
+
+Renders a synthetic episode (default: an hour of captions at ~2.4s per
+segment) and an index page with both implementations and reports the best
+time per page. Also reports the one-off cost of compiling a template cold
+versus loading its code object from the disk cache.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import legacy_render  # noqa: E402
+from ai_transcripts import render  # noqa: E402
+from ai_transcripts.templating import Environment  # noqa: E402
+
+
+def make_video(i):
+    return {
+        'video_id': f"vid{i:08d}",
+        'title': f"Episode {i}: why does my chatbot & I keep arguing? #ai",
+        'description': "We talk about LLMs, hallucinations and \"vibes\".\n" * 6,
+        'published_at': '2024-03-01T10:00:00Z',
+        'thumbnail': f"https://i.ytimg.com/vi/vid{i:08d}/hqdefault.jpg",
+    }
+
+
+def make_transcript(segments):
+    return [
+        {'text': f"so this is caption number {n} and it's fairly typical", 'start': n * 2.4, 'duration': 2.4}
+        for n in range(segments)
+    ]
+
+
+def best_of(func, repeat, number):
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--segments', type=int, default=1500)
+    parser.add_argument('--episodes', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    video = make_video(0)
+    transcript = make_transcript(args.segments)
+    videos = [make_video(i) for i in range(args.episodes)]
+
+    # Warm the template cache so we time rendering only
+    render.generate_episode_page(video, transcript)
+    render.generate_index_page(videos)
+
+    rows = [
+        ('episode page', args.segments,
+         lambda: legacy_render.generate_episode_page(video, transcript),
+         lambda: render.generate_episode_page(video, transcript)),
+        ('index page', args.episodes,
+         lambda: legacy_render.generate_index_page(videos),
+         lambda: render.generate_index_page(videos)),
+    ]
+    print(f"{'page':<14}{'items':>7}{'f-string ms':>14}{'template ms':>14}{'ratio':>8}")
+    for label, items, legacy, templated in rows:
+        old = best_of(legacy, args.repeat, 20)
+        new = best_of(templated, args.repeat, 20)
+        print(f"{label:<14}{items:>7}{old * 1e3:>14.3f}{new * 1e3:>14.3f}{new / old:>8.2f}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def load(cache):
+            Environment(render.TEMPLATE_DIR, cache_dir=cache, filters=render.get_environment().filters) \
+                .get_template('episode.html')
+
+        cold = best_of(lambda: load(None), args.repeat, 5)
+        load(cache_dir)
+        cached = best_of(lambda: load(cache_dir), args.repeat, 5)
+    print(f"\ntemplate load: compile {cold * 1e3:.2f} ms, disk cache {cached * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
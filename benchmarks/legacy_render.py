@@ -1,74 +1,11 @@
-#!/usr/bin/env python3
 """
-Artificial Insanity Podcast - Automatic Transcript Generator
-Fetches episodes from YouTube and generates SEO-optimized transcript pages
+Snapshot of the f-string page generators used before the template engine.
+Kept only so the render benchmark can compare against them.
 """
 
-import os
 import json
-import requests
 from datetime import datetime
-from youtube_transcript_api import YouTubeTranscriptApi
-from googleapiclient.discovery import build
 
-# Configuration
-YOUTUBE_API_KEY = os.environ.get('YOUTUBE_API_KEY')
-CHANNEL_ID = 'UC1g-EKfoM_OblzPGBF0N6bQ'
-TRANSCRIPTIONS_DIR = 'transcriptions'
-
-def get_channel_videos():
-    """Fetch all videos from the YouTube channel"""
-    youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
-    
-    videos = []
-    next_page_token = None
-    
-    while True:
-        # Get uploads playlist
-        channel_response = youtube.channels().list(
-            part='contentDetails',
-            id=CHANNEL_ID
-        ).execute()
-        
-        uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-        
-        # Get videos from uploads playlist
-        playlist_response = youtube.playlistItems().list(
-            part='snippet',
-            playlistId=uploads_playlist_id,
-            maxResults=50,
-            pageToken=next_page_token
-        ).execute()
-        
-        for item in playlist_response['items']:
-            video_id = item['snippet']['resourceId']['videoId']
-            title = item['snippet']['title']
-            description = item['snippet']['description']
-            published_at = item['snippet']['publishedAt']
-            thumbnail = item['snippet']['thumbnails']['high']['url']
-            
-            videos.append({
-                'video_id': video_id,
-                'title': title,
-                'description': description,
-                'published_at': published_at,
-                'thumbnail': thumbnail
-            })
-        
-        next_page_token = playlist_response.get('nextPageToken')
-        if not next_page_token:
-            break
-    
-    return videos
-
-def get_transcript(video_id):
-    """Fetch transcript for a video"""
-    try:
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-        return transcript_list
-    except Exception as e:
-        print(f"Could not fetch transcript for {video_id}: {e}")
-        return None
 
 def format_timestamp(seconds):
     """Convert seconds to MM:SS format"""
@@ -76,6 +13,27 @@ def format_timestamp(seconds):
     secs = int(seconds % 60)
     return f"{mins:02d}:{secs:02d}"
 
+
+def episode_schema(video):
+    """Build the PodcastEpisode JSON-LD block for an episode page"""
+    schema = {
+        "@context": "https://schema.org",
+        "@type": "PodcastEpisode",
+        "name": video['title'],
+        "description": f"{video['description'][:150]}...",
+        "datePublished": video['published_at'],
+        "url": f"https://www.youtube.com/watch?v={video['video_id']}",
+        "thumbnailUrl": video['thumbnail'],
+        "partOfSeries": {
+            "@type": "PodcastSeries",
+            "name": "Artificial Insanity",
+            "url": "https://artificialinsanity.com"
+        }
+    }
+    # json.dumps handles quoting; "</" would still close the <script> element early
+    return json.dumps(schema, ensure_ascii=False, indent=4).replace('</', '<\\/').replace('\n', '\n    ')
+
+
 def generate_episode_page(video, transcript):
     """Generate HTML page for individual episode"""
     
@@ -83,40 +41,37 @@ def generate_episode_page(video, transcript):
     pub_date = datetime.fromisoformat(video['published_at'].replace('Z', '+00:00'))
     formatted_date = pub_date.strftime('%B %d, %Y')
     
+    # Escape special characters in title and description
+    title_escaped = video['title'].replace('"', '&quot;').replace("'", '&#39;')
+    desc_escaped = video['description'].replace('"', '&quot;').replace("'", '&#39;')
+    schema_json = episode_schema(video)
+    
     # Generate transcript HTML with timestamps
     transcript_html = ""
     if transcript:
         for entry in transcript:
             timestamp = format_timestamp(entry['start'])
-            text = entry['text']
+            text = entry['text'].replace('<', '&lt;').replace('>', '&gt;')
             transcript_html += f'<p class="transcript-line"><span class="timestamp">[{timestamp}]</span> {text}</p>\n'
     else:
-        transcript_html = '<p class="no-transcript">Transcript not available for this episode.</p>'
+        transcript_html = '''<p class="no-transcript">Transcript not yet available for this episode. 
+        <br><br>This could be because:
+        <br>• Captions haven't been generated yet (usually takes 24-48 hours after upload)
+        <br>• Captions are disabled for this video
+        <br>• The video is too new
+        <br><br>Check back later or <a href="https://www.youtube.com/watch?v={}">watch on YouTube</a> to see if captions are available.</p>'''.format(video['video_id'])
     
     html = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{video['title']} - Transcript | Artificial Insanity Podcast</title>
-    <meta name="description" content="Full transcript of {video['title']} from Artificial Insanity podcast">
+    <title>{title_escaped} - Transcript | Artificial Insanity Podcast</title>
+    <meta name="description" content="Full transcript of {title_escaped} from Artificial Insanity podcast">
     
     <!-- SEO Schema Markup -->
     <script type="application/ld+json">
-    {{
-        "@context": "https://schema.org",
-        "@type": "PodcastEpisode",
-        "name": "{video['title']}",
-        "description": "{video['description'][:150]}...",
-        "datePublished": "{video['published_at']}",
-        "url": "https://www.youtube.com/watch?v={video['video_id']}",
-        "thumbnailUrl": "{video['thumbnail']}",
-        "partOfSeries": {{
-            "@type": "PodcastSeries",
-            "name": "Artificial Insanity",
-            "url": "https://artificialinsanity.com"
-        }}
-    }}
+    {schema_json}
     </script>
     
     <style>
@@ -174,6 +129,7 @@ def generate_episode_page(video, transcript):
             margin-bottom: 2rem;
             border-left: 4px solid #00ff00;
             color: #c0c0c0;
+            white-space: pre-wrap;
         }}
         
         .watch-link {{
@@ -210,6 +166,12 @@ def generate_episode_page(video, transcript):
         .no-transcript {{
             color: #808080;
             font-style: italic;
+            line-height: 1.8;
+        }}
+        
+        .no-transcript a {{
+            color: #00ff00;
+            text-decoration: underline;
         }}
     </style>
 </head>
@@ -223,9 +185,7 @@ def generate_episode_page(video, transcript):
             Published: {formatted_date}
         </div>
         
-        <div class="description">
-            {video['description']}
-        </div>
+        <div class="description">{video['description']}</div>
         
         <a href="https://www.youtube.com/watch?v={video['video_id']}" target="_blank" class="watch-link">
             ▶ WATCH ON YOUTUBE
@@ -242,6 +202,7 @@ def generate_episode_page(video, transcript):
     
     return html
 
+
 def generate_index_page(videos):
     """Generate main index page listing all episodes"""
     
@@ -251,13 +212,16 @@ def generate_index_page(videos):
         formatted_date = pub_date.strftime('%B %d, %Y')
         safe_filename = f"episode-{video['video_id']}.html"
         
+        title_escaped = video['title'].replace('"', '&quot;').replace("'", '&#39;')
+        desc_snippet = video['description'][:200].replace('<', '&lt;').replace('>', '&gt;')
+        
         episodes_html += f"""
         <div class="episode-card">
-            <img src="{video['thumbnail']}" alt="{video['title']}">
+            <img src="{video['thumbnail']}" alt="{title_escaped}">
             <div class="episode-info">
                 <h2><a href="{safe_filename}">{video['title']}</a></h2>
                 <p class="date">{formatted_date}</p>
-                <p class="description">{video['description'][:200]}...</p>
+                <p class="description">{desc_snippet}...</p>
                 <a href="{safe_filename}" class="read-transcript">Read Transcript →</a>
             </div>
         </div>
@@ -400,47 +364,3 @@ def generate_index_page(videos):
 </html>"""
     
     return html
-
-def main():
-    """Main execution function"""
-    print("🎙️  Fetching Artificial Insanity episodes from YouTube...")
-    
-    # Create transcriptions directory if it doesn't exist
-    os.makedirs(TRANSCRIPTIONS_DIR, exist_ok=True)
-    
-    # Get all videos
-    videos = get_channel_videos()
-    print(f"✓ Found {len(videos)} episodes")
-    
-    # Process each video
-    for i, video in enumerate(videos, 1):
-        print(f"\n📝 Processing {i}/{len(videos)}: {video['title']}")
-        
-        # Get transcript
-        transcript = get_transcript(video['video_id'])
-        
-        # Generate episode page
-        episode_html = generate_episode_page(video, transcript)
-        
-        # Save episode page
-        filename = f"episode-{video['video_id']}.html"
-        filepath = os.path.join(TRANSCRIPTIONS_DIR, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(episode_html)
-        
-        print(f"✓ Generated: {filename}")
-    
-    # Generate index page
-    print("\n📋 Generating index page...")
-    index_html = generate_index_page(videos)
-    index_path = os.path.join(TRANSCRIPTIONS_DIR, 'index.html')
-    
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(index_html)
-    
-    print(f"✓ Generated: index.html")
-    print(f"\n🎉 Done! All transcripts generated in /{TRANSCRIPTIONS_DIR}/")
-
-if __name__ == "__main__":
-    main()
@@ -0,0 +1,119 @@
+import os
+
+import pytest
+
+from ai_transcripts import store
+from ai_transcripts.cli import CHANGES_EXIT_CODE, main
+from ai_transcripts.pipeline import find_orphans, plan_render, print_plan, render_site
+
+
+def make_video(video_id, privacy_status='public'):
+    return {'video_id': video_id, 'title': f"Title {video_id}", 'description': 'About things',
+            'published_at': '2024-03-01T10:00:00Z', 'thumbnail': 'https://example.com/t.jpg',
+            'privacy_status': privacy_status}
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """A rendered site for episodes a, b and c, plus files pruning must leave alone"""
+    monkeypatch.chdir(tmp_path)
+    for video_id in ('a', 'b', 'c'):
+        store.save_transcript('data', video_id, [{'text': f"hello {video_id}", 'start': 0.0, 'duration': 1.0}])
+    store.save_catalogue('data', [make_video('a'), make_video('b'), make_video('c')])
+    render_site('data', 'out', store.load_catalogue('data'))
+    for name in ('about.html', 'episode-notes.txt', 'episodes.html'):
+        with open(os.path.join('out', name), 'w', encoding='utf-8') as f:
+            f.write('hand-written')
+    return 'out'
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def listing(out_dir):
+    return set(os.listdir(out_dir))
+
+
+UNTOUCHED = {'about.html', 'episode-notes.txt', 'episodes.html'}
+
+
+def test_removed_episode_is_deleted(site):
+    render_site('data', site, [make_video('a'), make_video('c')])
+    assert listing(site) == {'episode-a.html', 'episode-c.html', 'index.html'} | UNTOUCHED
+    assert 'episode-b.html' not in read('out/index.html')
+
+
+def test_removed_episode_is_tombstoned(site):
+    render_site('data', site, [make_video('a'), make_video('c')], orphans='tombstone')
+    assert 'episode-b.html' in listing(site)
+    assert 'hello b' not in read('out/episode-b.html')
+    assert 'episode-b.html' not in read('out/index.html')
+
+
+def test_removed_episode_is_kept(site):
+    before = read('out/episode-b.html')
+    render_site('data', site, [make_video('a'), make_video('c')], orphans='keep')
+    assert read('out/episode-b.html') == before
+    assert 'episode-b.html' not in read('out/index.html')
+
+
+@pytest.mark.parametrize('status', ['private', 'unavailable'])
+def test_hidden_videos_are_orphans(site, status):
+    videos = [make_video('a'), make_video('b', status), make_video('c')]
+    assert find_orphans(site, videos) == ['episode-b.html']
+    render_site('data', site, videos)
+    assert 'episode-b.html' not in listing(site)
+    assert 'episode-b.html' not in read('out/index.html')
+
+
+def test_unenriched_videos_count_as_public(site):
+    video = make_video('b')
+    del video['privacy_status']
+    assert find_orphans(site, [make_video('a'), video, make_video('c')]) == []
+
+
+def test_only_episode_pages_are_pruned(site):
+    render_site('data', site, [make_video('a')])
+    for name in UNTOUCHED:
+        assert read(os.path.join(site, name)) == 'hand-written'
+
+
+def test_empty_catalogue_writes_nothing(site, capsys):
+    before = {name: read(os.path.join(site, name)) for name in listing(site)}
+    render_site('data', site, [])
+    assert plan_render('data', site, []) == []
+    assert {name: read(os.path.join(site, name)) for name in listing(site)} == before
+    assert 'No episodes' in capsys.readouterr().out
+
+
+def test_plan_matches_render(site):
+    videos = [make_video('a'), make_video('c'), make_video('d')]
+    store.save_transcript('data', 'a', [{'text': 'edited', 'start': 0.0, 'duration': 1.0}])
+    plan = {filename: status for status, filename, _, _ in plan_render('data', site, videos)}
+    assert plan == {'episode-a.html': 'changed', 'episode-b.html': 'removed',
+                    'episode-c.html': 'unchanged', 'episode-d.html': 'added',
+                    'index.html': 'changed'}
+    # Planning writes nothing
+    assert listing(site) == {'episode-a.html', 'episode-b.html', 'episode-c.html', 'index.html'} | \
+        UNTOUCHED
+
+    render_site('data', site, videos)
+    assert all(status == 'unchanged' for status, *_ in plan_render('data', site, videos))
+
+
+@pytest.mark.parametrize('status, changes', [
+    ('unchanged', False), ('added', True), ('changed', True), ('removed', True),
+])
+def test_print_plan_reports_changes(status, changes):
+    plan = [('unchanged', 'index.html', 10, 10), (status, 'episode-a.html', 5, 7)]
+    assert print_plan(plan) is changes
+
+
+def test_dry_run_exit_code(site):
+    assert main(['--data-dir', 'data', '--out-dir', site, '--related', '0', '--dry-run']) == 0
+    store.save_catalogue('data', [make_video('a'), make_video('b')])
+    assert main(['--data-dir', 'data', '--out-dir', site, '--related', '0', '--dry-run',
+                 'render']) == CHANGES_EXIT_CODE
+    assert 'episode-c.html' in listing(site)
@@ -0,0 +1,135 @@
+import gzip
+import os
+
+import pytest
+
+from ai_transcripts import publish
+from ai_transcripts.cli import main
+from ai_transcripts.pipeline import publish_site
+from ai_transcripts.publish import (LocalDirectoryTarget, build_manifest, diff_manifests,
+                                    open_target)
+
+PAGE = '<p>' + 'caption text ' * 40 + '</p>\n'
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def read(path, mode='r'):
+    with open(path, mode) as f:
+        return f.read()
+
+
+class RecordingTarget(LocalDirectoryTarget):
+    """A local directory target that records what each publish sent"""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.uploaded = []
+        self.deleted = []
+
+    def upload(self, relative, source, entry):
+        self.uploaded.append(relative)
+        super().upload(relative, source, entry)
+
+    def delete(self, relative):
+        self.deleted.append(relative)
+        super().delete(relative)
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write('out/index.html', PAGE)
+    write('out/episode-a.html', PAGE + 'a')
+    write('out/episode-b.html', PAGE + 'b')
+    write('out/parts/a-2.html', 'short')
+    return 'out'
+
+
+def test_publish_round_trip(site):
+    target = RecordingTarget('mirror')
+    assert publish_site('data', site, target)
+    assert sorted(target.uploaded) == ['episode-a.html', 'episode-b.html', 'index.html',
+                                       'parts/a-2.html']
+    assert gzip.decompress(read('mirror/episode-a.html.gz', 'rb')).decode() == PAGE + 'a'
+    assert not os.path.exists('mirror/parts/a-2.html.gz')
+
+    target = RecordingTarget('mirror')
+    write('out/episode-a.html', PAGE + 'edited')
+    os.remove('out/episode-b.html')
+    assert publish_site('data', site, target)
+    assert (target.uploaded, target.deleted) == (['episode-a.html'], ['episode-b.html'])
+    assert read('mirror/episode-a.html') == PAGE + 'edited'
+    assert gzip.decompress(read('mirror/episode-a.html.gz', 'rb')).decode() == PAGE + 'edited'
+    assert not os.path.exists('mirror/episode-b.html')
+    assert not os.path.exists('mirror/episode-b.html.gz')
+
+    target = RecordingTarget('mirror')
+    assert not publish_site('data', site, target)
+    assert (target.uploaded, target.deleted) == ([], [])
+
+
+def test_dry_run_publishes_nothing(site):
+    target = RecordingTarget('mirror')
+    assert publish_site('data', site, target, dry_run=True)
+    assert (target.uploaded, target.deleted) == ([], [])
+    assert not os.path.exists('mirror')
+
+
+def test_shrunk_file_loses_its_gzip_variant(site):
+    publish_site('data', site, LocalDirectoryTarget('mirror'))
+    write('out/index.html', 'tiny')
+    publish_site('data', site, LocalDirectoryTarget('mirror'))
+    assert read('mirror/index.html') == 'tiny'
+    assert not os.path.exists('mirror/index.html.gz')
+
+
+def test_unchanged_entries_are_reused(site, monkeypatch):
+    previous = build_manifest(site)
+    write('out/episode-a.html', PAGE + 'edited')
+
+    compressed = []
+    gzip_variant = publish.gzip_variant
+    monkeypatch.setattr(publish, 'gzip_variant', lambda data: compressed.append(data) or gzip_variant(data))
+    manifest = build_manifest(site, previous)
+    assert compressed == [(PAGE + 'edited').encode()]
+    assert manifest['files']['index.html'] is previous['files']['index.html']
+    assert manifest['files']['episode-a.html'] != previous['files']['episode-a.html']
+
+
+def test_diff_manifests():
+    def manifest(**hashes):
+        return {'files': {path: {'sha256': digest} for path, digest in hashes.items()}}
+
+    assert diff_manifests(manifest(a='1', b='2'), None) == (['a', 'b'], [])
+    assert diff_manifests(manifest(a='1', b='3', c='4'), manifest(a='1', b='2', d='5')) == \
+        (['b', 'c'], ['d'])
+
+
+@pytest.mark.parametrize('spec, root', [('dir:site', 'site'), ('site', 'site'),
+                                        ('./a:b', './a:b'), ('dir:/srv/x', '/srv/x')])
+def test_open_target(spec, root):
+    assert open_target(spec).root == root
+
+
+@pytest.mark.parametrize('spec, message', [('dir:', 'no location'), ('', 'empty'),
+                                           ('s3:bucket', 'unknown publish target')])
+def test_open_target_rejects(spec, message):
+    with pytest.raises(ValueError, match=message):
+        open_target(spec)
+
+
+def test_cli_reports_bad_targets(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit) as exit_info:
+        main(['publish', 'dir:'])
+    assert exit_info.value.code == 2
+    assert 'no location' in capsys.readouterr().err
+
+    with pytest.raises(SystemExit, match='missing/ does not exist'):
+        main(['--out-dir', 'missing', 'publish', 'mirror'])
+    assert not os.path.exists('mirror')
@@ -0,0 +1,72 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+sparse = pytest.importorskip('scipy.sparse')
+
+from ai_transcripts import related, store  # noqa: E402
+
+
+def make_catalogue(data_dir, topics):
+    videos = []
+    for i, words in enumerate(topics):
+        video = {'video_id': f"v{i}", 'title': f"Episode {i}", 'description': words}
+        store.save_transcript(data_dir, video['video_id'],
+                              [{'text': words, 'start': 0.0, 'duration': 1.0}] * 3)
+        videos.append(video)
+    return videos
+
+
+def test_tokenize_drops_stopwords_and_short_words():
+    assert related.tokenize("So I think the Robots aren't OK, it's 2024!") == ['robots', '2024']
+
+
+@pytest.mark.parametrize('block_rows', [1, 2, 512])
+def test_keep_heaviest_keeps_exactly_max_terms(monkeypatch, block_rows):
+    monkeypatch.setattr(related, 'BLOCK_ROWS', block_rows)
+    rows = [[5, 1, 3, 3, 3, 2], [], [1, 2], [4, 4, 4, 4]]
+    data = np.array([w for row in rows for w in row], dtype=np.float32)
+    indices = np.concatenate([np.arange(len(row)) for row in rows]).astype(np.int32)
+    indptr = np.concatenate(([0], np.cumsum([len(row) for row in rows])))
+    matrix = related._keep_heaviest(sparse.csr_matrix((data, indices, indptr), shape=(4, 6)), 3)
+
+    kept = [sorted(zip(matrix.indices[a:b], matrix.data[a:b]))
+            for a, b in zip(matrix.indptr[:-1], matrix.indptr[1:])]
+    # Ties at the cut-off go to the earliest columns
+    assert kept == [[(0, 5), (2, 3), (3, 3)], [], [(0, 1), (1, 2)], [(0, 4), (1, 4), (2, 4)]]
+
+
+def test_tfidf_rows_are_unit_length():
+    rows = [(np.array([0, 1], np.int32), np.array([3, 1], np.int32)),
+            (np.array([], np.int32), np.array([], np.int32)),
+            (np.array([1, 2], np.int32), np.array([1, 1], np.int32))]
+    matrix = related.tfidf_matrix(rows, 3)
+    norms = np.sqrt(np.asarray(matrix.power(2).sum(axis=1)).ravel())
+    assert norms == pytest.approx([1, 0, 1], abs=1e-6)
+
+
+def test_related_episodes_ranks_by_shared_terms(tmp_path):
+    data_dir = str(tmp_path / 'data')
+    videos = make_catalogue(data_dir, [
+        'robots robots factory automation', 'robots factory welding automation',
+        'poetry sonnets verse', 'sonnets verse rhyme poetry',
+    ])
+    result = related.related_episodes(data_dir, videos, 1)
+    assert {video_id: [v['video_id'] for v in row] for video_id, row in result.items()} == \
+        {'v0': ['v1'], 'v1': ['v0'], 'v2': ['v3'], 'v3': ['v2']}
+
+
+def test_only_changed_episodes_are_tokenized(tmp_path, monkeypatch):
+    data_dir, cache_dir = str(tmp_path / 'data'), str(tmp_path / 'cache')
+    videos = make_catalogue(data_dir, ['robots factory', 'poetry verse', 'robots verse'])
+    first = related.related_episodes(data_dir, videos, 2, cache_dir)
+
+    calls = []
+    tokenize = related.tokenize
+    monkeypatch.setattr(related, 'tokenize', lambda text: calls.append(text) or tokenize(text))
+    assert related.related_episodes(data_dir, videos, 2, cache_dir) == first
+    assert calls == []
+
+    store.save_transcript(data_dir, 'v2', [{'text': 'poetry sonnets', 'start': 0.0, 'duration': 1.0}])
+    result = related.related_episodes(data_dir, videos, 1, cache_dir)
+    assert len(calls) == 1
+    assert [v['video_id'] for v in result['v2']] == ['v1']
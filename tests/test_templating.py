@@ -0,0 +1,146 @@
+import os
+
+import pytest
+
+from ai_transcripts.markup import Markup
+from ai_transcripts.templating import Environment, TemplateError
+
+
+def make_env(tmp_path, templates, cache_dir=None, filters=None):
+    template_dir = tmp_path / 'templates'
+    template_dir.mkdir(exist_ok=True)
+    for name, source in templates.items():
+        (template_dir / name).write_text(source, encoding='utf-8')
+    return Environment(str(template_dir), cache_dir=cache_dir, filters=filters)
+
+
+def render(tmp_path, source, **context):
+    return make_env(tmp_path, {'t.html': source}).get_template('t.html').render(**context)
+
+
+def test_output_is_autoescaped(tmp_path):
+    assert render(tmp_path, '<p>{{ text }}</p>', text='a & <b> "c" \'d\'') == \
+        '<p>a &amp; &lt;b&gt; &quot;c&quot; &#39;d&#39;</p>'
+
+
+def test_markup_is_not_escaped_twice(tmp_path):
+    assert render(tmp_path, '{{ html }}', html=Markup('<b>x</b>')) == '<b>x</b>'
+
+
+def test_safe_filter_skips_escaping(tmp_path):
+    assert render(tmp_path, '{{ html|safe }}', html='<b>x</b>') == '<b>x</b>'
+
+
+def test_literal_percent_signs_survive_formatting(tmp_path):
+    assert render(tmp_path, '100% {{ n }}%', n=5) == '100% 5%'
+
+
+def test_filters_with_and_without_arguments(tmp_path):
+    env = make_env(tmp_path, {'t.html': '{{ name|upper }} {{ name|pad(3) }}'},
+                   filters={'upper': str.upper, 'pad': lambda value, n: value + '.' * n})
+    assert env.get_template('t.html').render(name='<a>') == '&lt;A&gt; &lt;a&gt;...'
+
+
+def test_bitwise_or_is_not_mistaken_for_a_filter(tmp_path):
+    assert render(tmp_path, '{{ a | b }}', a=1, b=2) == '3'
+
+
+@pytest.mark.parametrize('value, expected', [(1, 'one'), (2, 'two'), (3, 'many')])
+def test_if_elif_else(tmp_path, value, expected):
+    source = '{% if n == 1 %}one{% elif n == 2 %}two{% else %}many{% endif %}'
+    assert render(tmp_path, source, n=value) == expected
+
+
+def test_for_with_tuple_target(tmp_path):
+    source = '{% for label, text in lines %}[{{ label }}={{ text }}]{% endfor %}'
+    assert render(tmp_path, source, lines=[('00:01', 'a<'), ('00:02', 'b')]) == \
+        '[00:01=a&lt;][00:02=b]'
+
+
+def test_set_binds_a_local(tmp_path):
+    source = '{% for v in items %}{% set doubled = v * 2 %}{{ doubled }},{% endfor %}'
+    assert render(tmp_path, source, items=[1, 2]) == '2,4,'
+
+
+def test_builtins_are_available(tmp_path):
+    assert render(tmp_path, '{{ len(items) }}', items=[1, 2, 3]) == '3'
+
+
+def test_block_tags_and_comments_swallow_their_lines(tmp_path):
+    source = '<ul>\n    {% for x in xs %}\n    <li>{{ x }}</li>\n    {% endfor %}\n    {# note #}\n</ul>\n'
+    assert render(tmp_path, source, xs=[1, 2]) == '<ul>\n    <li>1</li>\n    <li>2</li>\n</ul>\n'
+
+
+def test_render_to_streams_the_same_output(tmp_path):
+    template = make_env(tmp_path, {'t.html': 'a{{ x }}b'}).get_template('t.html')
+    parts = []
+    template.render_to(parts.append, x='<')
+    assert ''.join(parts) == template.render(x='<') == 'a&lt;b'
+
+
+def test_undefined_variable(tmp_path):
+    with pytest.raises(TemplateError, match="undefined template variable 'missing'"):
+        render(tmp_path, '{{ missing }}')
+
+
+@pytest.mark.parametrize('source, message', [
+    ('x\n{{ a[ }}', 't.html:2: invalid expression'),
+    ('{% for %}{% endfor %}', 'malformed for tag'),
+    ('{% for 1 + in xs %}{% endfor %}', 'invalid loop target'),
+    ('{% set = 1 %}', 'malformed set tag'),
+    ('{% endfor %}', 'unexpected endfor'),
+    ('{% for x in xs %}{% endif %}', 'unexpected endif'),
+    ('{% else %}', 'unexpected else'),
+    ('\n\n{% if x %}', 't.html:3: unclosed if tag'),
+    ('{% include "x" %}', "unknown tag 'include'"),
+])
+def test_syntax_errors(tmp_path, source, message):
+    with pytest.raises(TemplateError, match=message):
+        make_env(tmp_path, {'t.html': source}).get_template('t.html')
+
+
+def test_templates_are_compiled_once_per_environment(tmp_path):
+    env = make_env(tmp_path, {'t.html': 'v1'})
+    template = env.get_template('t.html')
+    (tmp_path / 'templates' / 't.html').write_text('v2', encoding='utf-8')
+    assert env.get_template('t.html') is template
+    env.invalidate('t.html')
+    assert env.get_template('t.html').render() == 'v2'
+
+
+def test_disk_cache_round_trip(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    source = '{% for a, b in rows %}{{ a }}={{ b|safe }};{% endfor %}'
+    first = make_env(tmp_path, {'t.html': source}, cache_dir=cache_dir).get_template('t.html')
+    cached = os.listdir(cache_dir)
+    assert len(cached) == 1
+
+    second = make_env(tmp_path, {'t.html': source}, cache_dir=cache_dir).get_template('t.html')
+    rows = [('<', '<i>')]
+    assert second.render(rows=rows) == first.render(rows=rows) == '&lt;=<i>;'
+    assert os.listdir(cache_dir) == cached
+
+
+def test_disk_cache_is_keyed_by_source(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    make_env(tmp_path, {'t.html': 'one'}, cache_dir=cache_dir).get_template('t.html')
+    env = make_env(tmp_path, {'t.html': 'two'}, cache_dir=cache_dir)
+    assert env.get_template('t.html').render() == 'two'
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_corrupt_disk_cache_is_recompiled(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    make_env(tmp_path, {'t.html': '{{ x }}'}, cache_dir=cache_dir).get_template('t.html')
+    (path,) = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, path), 'wb') as f:
+        f.write(b'garbage')
+    env = make_env(tmp_path, {'t.html': '{{ x }}'}, cache_dir=cache_dir)
+    assert env.get_template('t.html').render(x=1) == '1'
+
+
+def test_unwritable_cache_dir_still_renders(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    env = make_env(tmp_path, {'t.html': '{{ x }}'}, cache_dir=str(blocker / 'cache'))
+    assert env.get_template('t.html').render(x=1) == '1'
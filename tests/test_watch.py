@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from ai_transcripts import store
+from ai_transcripts.watch import Watcher
+
+
+def make_video(video_id):
+    return {'video_id': video_id, 'title': f"Title {video_id}", 'description': 'About things',
+            'published_at': '2024-03-01T10:00:00Z', 'thumbnail': 'https://example.com/t.jpg'}
+
+
+def touch(path):
+    """Move a file's mtime forward so the next poll sees it even within one clock tick"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for video_id in ('a', 'b'):
+        store.save_transcript('data', video_id, [{'text': f"hello {video_id}", 'start': 0.0, 'duration': 1.0}])
+    store.save_catalogue('data', [make_video('a'), make_video('b')])
+    watcher = Watcher('data', 'out')
+    os.makedirs('out')
+    watcher.poll()
+    return watcher
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_initial_build(site):
+    assert sorted(os.listdir('out')) == ['episode-a.html', 'episode-b.html', 'index.html']
+
+
+def test_transcript_edit_rewrites_only_its_page(site):
+    before = os.stat('out/episode-b.html').st_mtime_ns
+    store.save_transcript('data', 'a', [{'text': 'edited <line>', 'start': 0.0, 'duration': 1.0}])
+    touch(store.transcript_path('data', 'a'))
+    assert site.poll() == 1
+    assert 'edited &lt;line&gt;' in read('out/episode-a.html')
+    assert os.stat('out/episode-b.html').st_mtime_ns == before
+
+
+def test_failed_rebuild_is_retried_in_full(site, capsys):
+    with open(store.transcript_path('data', 'c'), 'w', encoding='utf-8') as f:
+        f.write('[{"text": "half writ')
+    store.save_catalogue('data', [make_video('a'), make_video('b'), make_video('c')])
+    touch(store.transcript_path('data', 'c'))
+    touch(os.path.join('data', store.CATALOGUE_FILE))
+    assert site.poll() == 0
+    assert 'Rebuild failed' in capsys.readouterr().out
+
+    store.save_transcript('data', 'c', [{'text': 'whole', 'start': 0.0, 'duration': 1.0}])
+    touch(store.transcript_path('data', 'c'))
+    site.poll()
+    assert 'whole' in read('out/episode-c.html')
+    assert 'episode-c.html' in read('out/index.html')
+
+
+def test_removed_episode_is_pruned(site):
+    store.save_catalogue('data', [make_video('a')])
+    touch(os.path.join('data', store.CATALOGUE_FILE))
+    site.poll()
+    assert sorted(os.listdir('out')) == ['episode-a.html', 'index.html']
+    assert 'episode-b.html' not in read('out/index.html')
+
+
+def test_empty_catalogue_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('out')
+    assert Watcher('data', 'out').poll() == 0
+    assert os.listdir('out') == []